@@ -0,0 +1,1078 @@
+"""
+Benchmarks for the search code.
+
+Each benchmark prints a small table of timings. Run one with:
+    py benchmark.py {name}
+where {name} is one of the keys of BENCHMARKS at the bottom of this file.
+"""
+
+import contextlib
+import heapq
+import io
+import math
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+
+import numpy as np
+
+import pathfinding
+import pathfinding.graph
+import pathfinding.search
+from pathfinding import (CSRGraph, ContractionHierarchy, DistanceTable, Graph, GraphProblem, Landmarks, Node,
+                         SearchBudget, SearchStats, alt_search, anytime_astar_search, astar_search,
+                         best_first_graph_search, bidirectional_astar_search, bidirectional_uniform_cost_search,
+                         breadth_first_graph_search, contraction_hierarchy_search, depth_first_graph_search,
+                         distance_table, iterative_deepening_astar_search, load_graph_from_file, parse_graph_file,
+                         run_algorithm, solve_batch, solve_files, uniform_cost_search)
+from pathfinding.utils import IndexedPriorityQueue, PriorityQueue, memoize
+import random_path_generator
+from utils import distance
+
+
+def grid_graph(n_nodes, degree=2, seed=0):
+    """Build a sparse directed graph of about n_nodes nodes laid out on a
+    jittered square grid. Each node links to degree of its 8 grid neighbours
+    and back, with the same cost rules as random_path_generator
+    (ceil(distance)*2, and one more on the way back).
+    Returns the graph, the origin (one corner) and the destinations (the
+    opposite corner), so a search has to cross the whole map."""
+    rng = random.Random(seed)
+    side = math.isqrt(n_nodes)
+    locations = {}
+    for i in range(side * side):
+        locations[i + 1] = (i % side + rng.uniform(-0.3, 0.3), i // side + rng.uniform(-0.3, 0.3))
+
+    graph = Graph()
+    steps = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+    for i in range(side * side):
+        x, y = i % side, i // side
+        backbone = [(1, 0), (0, 1)] if x == 0 else [(1, 0)]
+        for dx, dy in backbone + rng.sample(steps, degree):
+            if 0 <= x + dx < side and 0 <= y + dy < side:
+                j = (y + dy) * side + x + dx
+                cost = math.ceil(math.dist(locations[i + 1], locations[j + 1])) * 2
+                graph.graph_dict.setdefault(i + 1, {}).setdefault(j + 1, cost)
+                graph.graph_dict.setdefault(j + 1, {}).setdefault(i + 1, cost + 1)
+    graph.locations = locations
+    return graph, 1, [side * side]
+
+
+def write_graph_file(graph, origin, destinations, filename):
+    """Write a graph in the format load_graph_from_file reads."""
+    with open(filename, "w") as file:
+        file.write("Nodes:\n")
+        file.writelines(f"{node}: ({x},{y})\n" for node, (x, y) in graph.locations.items())
+        file.write("Edges:\n")
+        file.writelines(f"({a},{b}): {cost}\n" for a, links in graph.graph_dict.items() for b, cost in links.items())
+        file.write(f"Origin:\n{origin}\nDestinations:\n{'; '.join(map(str, destinations))}\n")
+
+
+def edge_count(graph):
+    return sum(len(links) for links in graph.graph_dict.values())
+
+
+def timed(search, *args):
+    """Return the result of search(*args) and its wall-clock time in ms."""
+    start = time.perf_counter()
+    result = search(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def expansions_per_second(frontier, size, expansions=2000, branching=3, seed=0):
+    """Fill frontier with size items, then time node expansions that pop one
+    item and generate branching children, each of which is either a new
+    item or a cheaper copy of one already in the frontier (the same
+    operations best_first_graph_search does for every child)."""
+    rng = random.Random(seed)
+    priority = {}
+    frontier.f = lambda item: priority[item]
+    for item in range(size):
+        priority[item] = rng.random()
+        frontier.append(item)
+
+    next_item = size
+    start = time.perf_counter()
+    for _ in range(expansions):
+        frontier.pop()
+        for _ in range(branching):
+            if rng.random() < 0.5:
+                child, cost = next_item, rng.random()
+                next_item += 1
+            else:
+                child, cost = rng.randrange(next_item), rng.random() / 2
+            if child in frontier:
+                if cost < frontier[child]:
+                    del frontier[child]
+                    priority[child] = cost
+                    frontier.append(child)
+            else:
+                priority[child] = cost
+                frontier.append(child)
+        # Keep the frontier at roughly the requested size
+        while len(frontier) > size:
+            frontier.pop()
+    return expansions / (time.perf_counter() - start)
+
+
+def bench_priority_queue():
+    """Expansions per second of PriorityQueue vs IndexedPriorityQueue as
+    the frontier grows."""
+    print(f"{'frontier':>10} {'PriorityQueue':>15} {'Indexed':>15} {'speedup':>8}")
+    for size in [100, 1000, 10000, 100000]:
+        old = expansions_per_second(PriorityQueue(), size, expansions=200 if size >= 10000 else 2000)
+        new = expansions_per_second(IndexedPriorityQueue(), size)
+        print(f"{size:>10} {old:>15.0f} {new:>15.0f} {new / old:>7.1f}x")
+
+
+def legacy_uniform_cost_search(problem):
+    """uniform_cost_search before the lazy-deletion rewrite, which scanned
+    and re-heapified the frontier for every generated child."""
+    node = Node(problem.initial)
+    explored = set()
+    if problem.goal_test(node.state):
+        return node, 0
+    frontier = [(node.path_cost, node)]
+    nodes_expanded = 0
+    while frontier:
+        cost, node = heapq.heappop(frontier)
+        nodes_expanded += 1
+        if problem.goal_test(node.state):
+            return node, nodes_expanded
+        explored.add(node.state)
+        for child in node.expand(problem):
+            if child.state not in explored and all(child.state != existing.state for _, existing in frontier):
+                heapq.heappush(frontier, (child.path_cost, child))
+            else:
+                for i, (c, existing) in enumerate(frontier):
+                    if existing.state == child.state and child.path_cost < existing.path_cost:
+                        frontier[i] = (child.path_cost, child)
+                        heapq.heapify(frontier)
+                        break
+    return None, nodes_expanded
+
+
+def bench_uniform_cost_search():
+    """Corner-to-corner uniform_cost_search vs the old frontier-scanning
+    version on grid graphs with 10^4 - 10^6 edges."""
+    print(f"{'edges':>9} {'expanded':>9} {'old ms':>10} {'new ms':>10} {'speedup':>8}")
+    for n_nodes in [2500, 25000, 250000]:
+        graph, origin, dest = grid_graph(n_nodes)
+        (node, expanded, _), new = timed(uniform_cost_search, GraphProblem(origin, dest, graph))
+        (old_node, old_expanded), old = timed(legacy_uniform_cost_search, GraphProblem(origin, dest, graph))
+        assert (old_node.path(), old_expanded) == (node.path(), expanded)
+        print(f"{edge_count(graph):>9} {expanded:>9} {old:>10.0f} {new:>10.0f} {old / new:>7.1f}x")
+
+def legacy_depth_first_graph_search(problem):
+    """depth_first_graph_search before the frontier set, which tested
+    `child not in frontier` against the whole stack."""
+    frontier = [(Node(problem.initial))]
+    explored = set()
+    while frontier:
+        node = frontier.pop()
+        if problem.goal_test(node.state):
+            return node, len(explored)
+        explored.add(node.state)
+        frontier.extend(child for child in node.expand(problem)
+                        if child.state not in explored and child not in frontier)
+    return None, len(explored)
+
+
+def legacy_breadth_first_graph_search(problem):
+    """breadth_first_graph_search before the frontier set, which tested
+    `child not in frontier` against the whole queue."""
+    node = Node(problem.initial)
+    explored = set()
+    if problem.goal_test(node.state):
+        return node, len(explored)
+    frontier = deque([node])
+    while frontier:
+        node = frontier.popleft()
+        explored.add(node.state)
+        for child in node.expand(problem):
+            if child.state not in explored and child not in frontier:
+                if problem.goal_test(child.state):
+                    return child, len(explored)
+                frontier.append(child)
+    return None, len(explored)
+
+
+def bench_uninformed_search(legacy_limit=100000):
+    """Corner-to-corner DFS and BFS with the frontier set (and with
+    reuse_explored) vs the old list/deque scans on sparse grid graphs of
+    10^3 - 10^6 nodes. The old versions are quadratic in the frontier size
+    and are skipped above legacy_limit nodes."""
+    searches = [("DFS", depth_first_graph_search, legacy_depth_first_graph_search),
+                ("BFS", breadth_first_graph_search, legacy_breadth_first_graph_search)]
+    print(f"{'search':>6} {'nodes':>8} {'expanded':>9} {'old ms':>10} {'new ms':>10} {'reuse ms':>10} {'speedup':>8}")
+    for n_nodes in [1000, 10000, 100000, 1000000]:
+        graph, origin, dest = grid_graph(n_nodes)
+        for name, search, legacy_search in searches:
+            (node, expanded, _), new = timed(search, GraphProblem(origin, dest, graph))
+            (reuse_node, reuse_expanded, _), reuse = timed(search, GraphProblem(origin, dest, graph), True)
+            assert (reuse_node.path(), reuse_expanded) == (node.path(), expanded)
+            if n_nodes <= legacy_limit:
+                (old_node, old_expanded), old = timed(legacy_search, GraphProblem(origin, dest, graph))
+                assert (old_node.path(), old_expanded) == (node.path(), expanded)
+                print(f"{name:>6} {n_nodes:>8} {expanded:>9} {old:>10.0f} {new:>10.0f} {reuse:>10.0f} "
+                      f"{old / new:>7.1f}x")
+            else:
+                print(f"{name:>6} {n_nodes:>8} {expanded:>9} {'-':>10} {new:>10.0f} {reuse:>10.0f} {'-':>8}")
+
+
+def legacy_iterative_deepening_astar_search(problem):
+    """iterative_deepening_astar_search before the explicit stack, which
+    recursed once per node, had no cycle check and failed on RecursionError."""
+    h = memoize(problem.h, 'h')
+    visited = [0]
+
+    def search(node, f_limit):
+        try:
+            visited[0] += 1
+            f_value = node.path_cost + h(node)
+            if f_value > f_limit:
+                return 'cutoff', f_value
+            if problem.goal_test(node.state):
+                return node, None
+            next_f = float('inf')
+            for child in node.expand(problem):
+                result, new_f = search(child, f_limit)
+                if result == 'cutoff':
+                    next_f = min(next_f, new_f if new_f is not None else float('inf'))
+                elif result is not None:
+                    return result, None
+            return 'cutoff', next_f if next_f < float('inf') else None
+        except RecursionError:
+            return None, None
+
+    root = Node(problem.initial)
+    threshold = root.path_cost + h(root)
+    if problem.goal_test(root.state):
+        return root, 0
+    while True:
+        result, threshold = search(root, threshold)
+        if result != 'cutoff':
+            return result, visited[0]
+        if threshold is None:
+            return None, visited[0]
+
+
+def chain_graph(n_nodes):
+    """A one-way path 1 -> 2 -> ... -> n_nodes, too deep to search recursively."""
+    graph = Graph()
+    for i in range(1, n_nodes):
+        graph.connect1(i, i + 1, 1)
+    graph.locations = {i: (i, 0) for i in range(1, n_nodes + 1)}
+    return graph, 1, [n_nodes]
+
+
+def bench_iterative_deepening_astar_search(files=("test_10.txt", "test_8.txt", "PathFinder-test.txt")):
+    """Nodes visited and runtime of CUS2 (IDA*) without and with a
+    transposition table vs the old recursive version, on test maps, small
+    grid graphs, and a chain deeper than the recursion limit."""
+    maps = [(file, *load_graph_from_file(file)) for file in files]
+    maps += [(f"grid {n}", *grid_graph(n)) for n in (36, 49, 64)]
+    maps.append(("chain 5000", *chain_graph(5000)))
+    print(f"{'map':>20} {'old visits':>11} {'old ms':>9} {'visits':>9} {'ms':>9} {'table visits':>13} {'table ms':>9}")
+    for name, graph, origin, dest in maps:
+        (old_node, old_visits), old = timed(legacy_iterative_deepening_astar_search, GraphProblem(origin, dest, graph))
+        node, visits, new = iterative_deepening_astar_search(GraphProblem(origin, dest, graph))
+        table_node, table_visits, table = iterative_deepening_astar_search(GraphProblem(origin, dest, graph),
+                                                                           table_size=10000)
+        assert node is table_node is None or node.path_cost == table_node.path_cost
+        if old_node is None and node is not None:
+            old_visits = "failed"
+        print(f"{name:>20} {old_visits:>11} {old:>9.0f} {visits:>9} {new:>9.0f} {table_visits:>13} {table:>9.0f}")
+
+
+def allocated(build):
+    """Return build() and the number of bytes it left allocated."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def bench_csr_graph():
+    """Memory per link of the dict-of-dicts Graph vs the frozen CSRGraph
+    (links and locations), all it allocates and its arrays alone
+    (CSRGraph.nbytes), and the time CUS1 takes on each."""
+    print(f"{'nodes':>8} {'links':>9} {'Graph B/link':>13} {'CSR B/link':>11} {'arrays B/link':>14} "
+          f"{'Graph ms':>9} {'CSR ms':>9}")
+    for n_nodes in [10000, 100000, 1000000]:
+        graph, origin, dest = grid_graph(n_nodes)
+        links = edge_count(graph)
+
+        def copy():
+            g = Graph({a: dict(b) for a, b in graph.graph_dict.items()})
+            g.locations = {a: tuple(xy) for a, xy in graph.locations.items()}
+            return g
+        graph, dict_bytes = allocated(copy)
+        frozen, csr_bytes = allocated(graph.freeze)
+        _, dict_ms = timed(uniform_cost_search, GraphProblem(origin, dest, graph))
+        _, csr_ms = timed(uniform_cost_search, GraphProblem(origin, dest, frozen))
+        print(f"{n_nodes:>8} {links:>9} {dict_bytes / links:>13.0f} {csr_bytes / links:>11.0f} "
+              f"{frozen.nbytes() / links:>14.0f} {dict_ms:>9.0f} {csr_ms:>9.0f}")
+
+
+class LegacyNode:
+    """Node before __slots__: every instance has a __dict__, f and h are
+    added to it by memoize, and expand builds a list of all children."""
+
+    def __init__(self, state, parent=None, action=None, path_cost=0):
+        self.state = state
+        self.parent = parent
+        self.action = action
+        self.path_cost = path_cost
+        self.depth = 0
+        if parent:
+            self.depth = parent.depth + 1
+
+    def __lt__(self, node):
+        return self.state < node.state
+
+    def expand(self, problem):
+        return [self.child_node(problem, action)
+                for action in problem.actions(self.state)]
+
+    def child_node(self, problem, action):
+        next_state = problem.result(self.state, action)
+        return LegacyNode(next_state, self, action, problem.path_cost(self.path_cost, self.state, action, next_state))
+
+    def solution(self):
+        return [node.action for node in self.path()[1:]]
+
+    def path(self):
+        node, path_back = self, []
+        while node:
+            path_back.append(node)
+            node = node.parent
+        return list(reversed(path_back))
+
+    def __eq__(self, other):
+        return isinstance(other, LegacyNode) and self.state == other.state
+
+    def __hash__(self):
+        return hash(self.state)
+
+
+def peak_memory(search, *args):
+    """Return the result of search(*args) and the peak bytes it allocated."""
+    tracemalloc.start()
+    result = search(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, peak
+
+
+def bench_nodes():
+    """Peak memory (tracemalloc) and runtime of every run_algorithm method
+    with the slotted Node vs the old __dict__ Node."""
+    big = grid_graph(40000)
+    small = grid_graph(49)
+    print(f"{'method':>6} {'old peak KiB':>13} {'new peak KiB':>13} {'old ms':>8} {'new ms':>8}")
+    for method in ["DFS", "BFS", "GBFS", "AS", "CUS1", "CUS2"]:
+        graph, origin, dest = small if method == "CUS2" else big
+        results = []
+        for node_class in (LegacyNode, Node):
+            pathfinding.search.Node = pathfinding.graph.Node = node_class
+            try:
+                (node, _, ms), peak = peak_memory(run_algorithm, method, GraphProblem(origin, dest, graph))
+                _, _, ms = run_algorithm(method, GraphProblem(origin, dest, graph))
+            finally:
+                pathfinding.search.Node = pathfinding.graph.Node = Node
+            results.append((node.path_cost, peak, ms))
+        (old_cost, old_peak, old_ms), (new_cost, new_peak, new_ms) = results
+        assert old_cost == new_cost
+        print(f"{method:>6} {old_peak / 1024:>13.0f} {new_peak / 1024:>13.0f} {old_ms:>8.0f} {new_ms:>8.0f}")
+
+
+def legacy_h(problem, goals):
+    """GraphProblem.h before the precomputed table: a generator over every
+    goal with scalar np.hypot on each call."""
+    locs = problem.graph.locations
+    return lambda node: min(int(distance(locs[node.state], locs[goal])) for goal in goals)
+
+
+def bench_heuristic(n_nodes=250000, n_goals=(1, 10, 100)):
+    """GBFS and A* time with the old per-call heuristic vs the precomputed
+    table (including the time to build it) and the lazily filled one, for
+    growing numbers of destinations."""
+    graph, origin, dest = grid_graph(n_nodes)
+    rng = random.Random(0)
+    print(f"{'goals':>6} {'search':>6} {'old ms':>9} {'table ms':>9} {'build ms':>9} {'lazy ms':>9}")
+    for n in n_goals:
+        goals = dest + rng.sample(range(n_nodes // 2, n_nodes), n - 1)
+        for name, search in [("GBFS", best_first_graph_search), ("AS", astar_search)]:
+            problem = GraphProblem(origin, goals, graph, lazy_h=True)
+            node, _, old = search(problem, legacy_h(problem, goals))
+            problem = GraphProblem(origin, goals, graph)
+            _, build = timed(problem.build_h_table)
+            table_node, _, table = search(problem, problem.h)
+            problem = GraphProblem(origin, goals, graph, lazy_h=True)
+            lazy_node, _, lazy = search(problem, problem.h)
+            assert node.path() == table_node.path() == lazy_node.path()
+            print(f"{n:>6} {name:>6} {old:>9.0f} {table:>9.0f} {build:>9.0f} {lazy:>9.0f}")
+
+
+def bench_alt(n_nodes=(10000, 100000), n_queries=20, k=8):
+    """Average expansions and latency of CUS1, AS and ALT over random
+    queries on grid graphs, plus the landmark preprocessing time."""
+    rng = random.Random(0)
+    print(f"{'nodes':>7} {'search':>6} {'expanded':>9} {'ms':>8}")
+    for n in n_nodes:
+        graph, _, _ = grid_graph(n)
+        landmarks, build = timed(Landmarks, graph, k)
+        print(f"{n:>7} preprocessing {k} landmarks: {build:.0f} ms")
+        queries = [(rng.choice(graph.nodes()), [rng.choice(graph.nodes())]) for _ in range(n_queries)]
+        searches = [("CUS1", lambda p: uniform_cost_search(p)),
+                    ("AS", lambda p: astar_search(p)),
+                    ("ALT", lambda p: alt_search(p, landmarks))]
+        costs = {}
+        for name, search in searches:
+            total_expanded = total_ms = 0
+            for origin, dest in queries:
+                problem = GraphProblem(origin, dest, graph)
+                (node, expanded, _), ms = timed(search, problem)
+                assert costs.setdefault((origin, dest[0]), node.path_cost) == node.path_cost
+                total_expanded += expanded
+                total_ms += ms
+            print(f"{n:>7} {name:>6} {total_expanded / n_queries:>9.0f} {total_ms / n_queries:>8.1f}")
+
+
+def bench_bidirectional(files=("test_1.txt", "test_5.txt", "PathFinder-test.txt"), n_nodes=(10000, 100000, 1000000),
+                        n_queries=10):
+    """Expansions and latency of CUS1 and AS vs their bidirectional
+    versions on test maps and on random queries over grid graphs."""
+    searches = [("CUS1", uniform_cost_search), ("BUCS", bidirectional_uniform_cost_search),
+                ("AS", astar_search), ("BAS", bidirectional_astar_search)]
+    rng = random.Random(0)
+    print(f"{'map':>20} {'search':>6} {'expanded':>9} {'ms':>9}")
+    maps = [(file, load_graph_from_file(file)[0], [load_graph_from_file(file)[1:]]) for file in files]
+    for n in n_nodes:
+        graph, _, _ = grid_graph(n)
+        nodes = graph.nodes()
+        maps.append((f"grid {n}", graph, [(rng.choice(nodes), [rng.choice(nodes)]) for _ in range(n_queries)]))
+    for name, graph, queries in maps:
+        costs = {}
+        for search_name, search in searches:
+            total_expanded = total_ms = 0
+            for i, (origin, dest) in enumerate(queries):
+                (node, expanded, _), ms = timed(search, GraphProblem(origin, dest, graph))
+                assert costs.setdefault(i, node and node.path_cost) == (node and node.path_cost)
+                total_expanded += expanded
+                total_ms += ms
+            print(f"{name:>20} {search_name:>6} {total_expanded / len(queries):>9.0f} {total_ms / len(queries):>9.1f}")
+
+
+def bench_contraction_hierarchy(n_nodes=(2000, 10000), n_queries=100, filename="benchmark.ch.npz"):
+    """Preprocessing time, shortcut count and size on disk of a contraction
+    hierarchy, and its query expansions and latency vs CUS1 over random
+    queries on grid graphs."""
+    rng = random.Random(0)
+    print(f"{'nodes':>6} {'links':>6} {'shortcuts':>9} {'build ms':>9} {'save ms':>8} {'load ms':>8} {'KiB':>6}"
+          f" {'CUS1 exp':>9} {'CH exp':>7} {'CUS1 ms':>8} {'CH ms':>6} {'speedup':>7}")
+    for n in n_nodes:
+        graph, _, _ = grid_graph(n)
+        hierarchy, build = timed(ContractionHierarchy, graph)
+        _, save = timed(hierarchy.save, filename)
+        hierarchy, load = timed(ContractionHierarchy.load, filename)
+        size = os.path.getsize(filename) / 1024
+        os.remove(filename)
+        nodes = graph.nodes()
+        queries = [(rng.choice(nodes), [rng.choice(nodes)]) for _ in range(n_queries)]
+        totals = {"CUS1": [0, 0], "CH": [0, 0]}
+        for origin, dest in queries:
+            problem = GraphProblem(origin, dest, graph)
+            (node, expanded, _), ms = timed(uniform_cost_search, problem)
+            (ch_node, ch_expanded, _), ch_ms = timed(contraction_hierarchy_search, problem, hierarchy)
+            assert (node and node.path_cost) == (ch_node and ch_node.path_cost)
+            totals["CUS1"][0] += expanded
+            totals["CUS1"][1] += ms
+            totals["CH"][0] += ch_expanded
+            totals["CH"][1] += ch_ms
+        (cus_expanded, cus_ms), (ch_expanded, ch_ms) = totals["CUS1"], totals["CH"]
+        print(f"{n:>6} {edge_count(graph):>6} {len(hierarchy.middle):>9} {build:>9.0f} {save:>8.0f} {load:>8.0f}"
+              f" {size:>6.0f} {cus_expanded / n_queries:>9.0f} {ch_expanded / n_queries:>7.0f}"
+              f" {cus_ms / n_queries:>8.2f} {ch_ms / n_queries:>6.2f} {cus_ms / ch_ms:>6.1f}x")
+
+
+def bench_batch(n_nodes=100000, n_origins=20, n_queries=400, n_single=20):
+    """Queries per second on one grid graph: one GraphProblem and search
+    per query (as runGraphSeacrh does, on the first n_single queries) vs
+    solve_batch, which answers all queries sharing an origin with one
+    uniform cost search tree."""
+    graph, _, _ = grid_graph(n_nodes)
+    rng = random.Random(0)
+    nodes = graph.nodes()
+    origins = [rng.choice(nodes) for _ in range(n_origins)]
+    queries = [(rng.choice(origins), [rng.choice(nodes)]) for _ in range(n_queries)]
+    print(f"{n_nodes} nodes, {n_queries} queries from {n_origins} origins")
+    print(f"{'method':>24} {'queries':>8} {'s':>8} {'queries/s':>10}")
+    costs = {}
+    for name, method in [("CUS1 per query", "CUS1"), ("BUCS per query", "BUCS")]:
+        start = time.perf_counter()
+        for i, (origin, dest) in enumerate(queries[:n_single]):
+            node, _, _ = run_algorithm(method, GraphProblem(origin, dest, graph))
+            assert costs.setdefault(i, node and node.path_cost) == (node and node.path_cost)
+        seconds = time.perf_counter() - start
+        print(f"{name:>24} {n_single:>8} {seconds:>8.2f} {n_single / seconds:>10.1f}")
+    for name, method in [("solve_batch CUS1", "CUS1")]:
+        start = time.perf_counter()
+        answered = 0
+        for i, node, _, _ in solve_batch(graph, queries, method):
+            assert costs.setdefault(i, node and node.path_cost) == (node and node.path_cost)
+            answered += 1
+        seconds = time.perf_counter() - start
+        print(f"{name:>24} {answered:>8} {seconds:>8.2f} {answered / seconds:>10.1f}")
+
+
+def dense_graph(n_nodes, density, seed=0):
+    """Build a directed graph linking about density of all node pairs,
+    with random integer costs."""
+    rng = random.Random(seed)
+    graph = Graph()
+    for a in range(n_nodes):
+        for b in rng.sample(range(n_nodes), int(density * n_nodes)):
+            if a != b:
+                graph.connect1(a, b, rng.randint(1, 100))
+    return graph
+
+
+def bench_distance_table(dense=(200, 400, 800), density=0.1, n_nodes=10000, n_depots=100, n_stops=1000,
+                         n_single=20, prefix="benchmark.table"):
+    """Floyd-Warshall vs repeated Dijkstra for all-pairs tables on dense
+    graphs, and a depots x stops table on a sparse grid graph vs one CUS1
+    search per pair, with the time to save it and memory-map it back."""
+    print(f"{'dense nodes':>11} {'links':>7} {'FW s':>7} {'Dijkstra s':>10}")
+    for n in dense:
+        graph = dense_graph(n, density)
+        fw, fw_ms = timed(distance_table, graph, None, None, 'floyd_warshall')
+        dijkstra, dijkstra_ms = timed(distance_table, graph, None, None, 'dijkstra')
+        assert np.array_equal(fw.costs, dijkstra.costs)
+        print(f"{n:>11} {edge_count(graph):>7} {fw_ms / 1000:>7.2f} {dijkstra_ms / 1000:>10.2f}")
+
+    graph, _, _ = grid_graph(n_nodes)
+    rng = random.Random(0)
+    nodes = graph.nodes()
+    depots, stops = rng.sample(nodes, n_depots), rng.sample(nodes, n_stops)
+    table, table_ms = timed(distance_table, graph, depots, stops)
+    start = time.perf_counter()
+    for _ in range(n_single):
+        depot, stop = rng.choice(depots), rng.choice(stops)
+        node, _, _ = run_algorithm("CUS1", GraphProblem(depot, stop, graph))
+        assert node.path_cost == table.cost(depot, stop)
+    per_pair = (time.perf_counter() - start) / n_single
+    _, save_ms = timed(table.save, prefix)
+    loaded, load_ms = timed(DistanceTable.load, prefix)
+    assert np.array_equal(loaded.costs, table.costs)
+    size = sum(os.path.getsize(file) for file in DistanceTable.files(prefix)) / 2 ** 20
+    for file in DistanceTable.files(prefix):
+        os.remove(file)
+    print(f"{n_depots} x {n_stops} table on {n_nodes} nodes: {table_ms / 1000:.1f} s "
+          f"(one CUS1 per pair: {per_pair * n_depots * n_stops:.0f} s estimated from {n_single} pairs)")
+    print(f"save {save_ms:.0f} ms, memory-mapped load {load_ms:.1f} ms, {size:.1f} MiB on disk")
+
+
+def bench_parallel(n_files=6, n_nodes=2000, algorithms=("DFS", "BFS", "GBFS", "AS", "CUS1"), workers=(2, 4)):
+    """Wall-clock time of running every (file, algorithm) job one after
+    another vs on a process pool, as py path_finding_algorithms.py -a -a
+    -j N does (without the GUI). CUS2 is left out by default, as IDA*
+    without a transposition table takes minutes on a grid this size."""
+    directory = tempfile.mkdtemp()
+    files = []
+    for seed in range(n_files):
+        graph, origin, destinations = grid_graph(n_nodes, seed=seed)
+        files.append(os.path.join(directory, f"test_{seed + 1}.txt"))
+        write_graph_file(graph, origin, destinations, files[-1])
+    jobs = [(file, algo) for file in files for algo in algorithms]
+    print(f"{len(jobs)} jobs ({n_files} files of {n_nodes} nodes x {len(algorithms)} algorithms), "
+          f"{os.cpu_count()} CPUs")
+    with contextlib.redirect_stdout(io.StringIO()):
+        serial, serial_ms = timed(lambda: list(solve_files(jobs)))
+    print(f"{'workers':>8} {'s':>8} {'speedup':>8}")
+    print(f"{'serial':>8} {serial_ms / 1000:>8.2f} {1:>7.2f}x")
+    for n in workers:
+        with contextlib.redirect_stdout(io.StringIO()):
+            results, ms = timed(lambda: list(solve_files(jobs, n)))
+        assert [result[:3] + result[4:] for result in results] == [result[:3] + result[4:] for result in serial]
+        print(f"{n:>8} {ms / 1000:>8.2f} {serial_ms / ms:>7.2f}x")
+    shutil.rmtree(directory)
+
+
+def bench_stats(n_nodes=40000, methods=("DFS", "BFS", "GBFS", "AS", "CUS1", "BUCS", "BAS"), runs=3):
+    """Runtime of each search (best of runs) without stats vs with a
+    SearchStats, and the counts it collected, crossing a grid graph."""
+    graph, origin, dest = grid_graph(n_nodes)
+    print(f"{'search':>6} {'off ms':>8} {'on ms':>8} {'cost':>6}  stats")
+    for method in methods:
+        times = {}
+        for enabled in (False, True):
+            times[enabled] = math.inf
+            for _ in range(runs):
+                stats = SearchStats() if enabled else None
+                with contextlib.redirect_stdout(io.StringIO()):
+                    _, ms = timed(run_algorithm, method, GraphProblem(origin, dest, graph), stats)
+                times[enabled] = min(times[enabled], ms)
+        print(f"{method:>6} {times[False]:>8.1f} {times[True]:>8.1f} {times[True] / times[False] - 1:>6.0%}  "
+              f"{' '.join(f'{name}={value}' for name, value in stats.as_dict().items())}")
+
+
+def bench_budget(n_nodes=40000, methods=("DFS", "BFS", "GBFS", "AS", "CUS1", "BUCS", "BAS"), runs=3):
+    """Runtime of each search (best of runs) without a budget vs with a
+    SearchBudget it never reaches, crossing a grid graph; then how soon
+    CUS2 on the same graph, which would run for hours, stops at a 1 s
+    time limit."""
+    graph, origin, dest = grid_graph(n_nodes)
+    never = SearchBudget(max_expansions=10 ** 9, time_limit=3600, max_frontier=10 ** 9, max_explored=10 ** 9)
+    print(f"{'search':>6} {'off ms':>8} {'on ms':>8} {'cost':>6}")
+    for method in methods:
+        times = {}
+        for budget in (None, never):
+            times[budget] = math.inf
+            for _ in range(runs):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    _, ms = timed(run_algorithm, method, GraphProblem(origin, dest, graph), None, budget)
+                times[budget] = min(times[budget], ms)
+        print(f"{method:>6} {times[None]:>8.1f} {times[never]:>8.1f} {times[never] / times[None] - 1:>6.0%}")
+    start = time.perf_counter()
+    try:
+        run_algorithm("CUS2", GraphProblem(origin, dest, graph), None, SearchBudget(time_limit=1))
+    except pathfinding.BudgetExceeded as exceeded:
+        print(f"CUS2 with time_limit=1: {exceeded} (stopped {time.perf_counter() - start:.3f} s after it started)")
+
+
+def bench_anytime(n_nodes=(10000, 100000, 1000000)):
+    """A* vs every solution anytime_astar_search (ARA*) yields, with the
+    time and expansions it took, crossing grid graphs: how soon a first
+    path is found, how close it is to optimal and how the bound tightens."""
+    print(f"{'nodes':>8} {'search':>12} {'expanded':>9} {'ms':>9} {'cost':>6} {'bound':>6}")
+    for n in n_nodes:
+        graph, origin, dest = grid_graph(n)
+        (node, expanded, _), ms = timed(astar_search, GraphProblem(origin, dest, graph))
+        print(f"{n:>8} {'AS':>12} {expanded:>9} {ms:>9.1f} {node.path_cost:>6} {1:>6.3f}")
+        start = time.perf_counter()
+        for node, expanded, _, bound in anytime_astar_search(GraphProblem(origin, dest, graph)):
+            ms = (time.perf_counter() - start) * 1000
+            print(f"{n:>8} {'ARA':>12} {expanded:>9} {ms:>9.1f} {node.path_cost:>6} {bound:>6.3f}")
+
+
+def legacy_load_graph_from_file(filename):
+    """load_graph_from_file before the bulk parser, which split every line
+    in Python and then scanned every edge for every node."""
+    nodes = {}
+    edges = {}
+    origin = None
+    destinations = []
+    graph_map = Graph()
+    with open(filename, 'r') as file:
+        lines = file.readlines()
+    section = None
+    for line in lines:
+        line = line.strip()
+        if line in ("Nodes:", "Edges:", "Origin:", "Destinations:"):
+            section = line[:-1].lower()
+            continue
+        if not line:
+            continue
+        if section == "nodes":
+            parts = line.split(":")
+            nodes[int(parts[0])] = list(map(float, parts[1].strip(" ()").split(',')))
+        elif section == "edges":
+            parts = line.split(":")
+            n1, n2 = map(int, parts[0].strip(" ()").split(','))
+            edges.setdefault((n1, n2), round(float(parts[1])))
+        elif section == "origin":
+            origin = int(line)
+        elif section == "destinations":
+            destinations = list(map(int, line.split(';')))
+    for node in nodes:
+        for n, cost in edges.items():
+            if n[0] == node:
+                graph_map.connect1(n[0], n[1], cost)
+    graph_map.locations = nodes
+    return graph_map, origin, destinations
+
+
+def bench_parse(n_nodes=(1000, 5000, 10000, 100000, 1000000), legacy_limit=5000):
+    """Parse throughput of parse_graph_file vs the old line-by-line
+    loader (on maps of up to legacy_limit nodes) on grid map files, which
+    must give the same graph, links in the same order."""
+    directory = tempfile.mkdtemp()
+    print(f"{'nodes':>8} {'edges':>8} {'MB':>7} {'loader':>7} {'s':>8} {'MB/s':>7}")
+    for n in n_nodes:
+        filename = os.path.join(directory, "map.txt")
+        graph, origin, destinations = grid_graph(n)
+        write_graph_file(graph, origin, destinations, filename)
+        del graph
+        mb = os.path.getsize(filename) / 2 ** 20
+        loaders = [("new", parse_graph_file)]
+        if n <= legacy_limit:
+            loaders.append(("old", legacy_load_graph_from_file))
+        loaded = []
+        for name, loader in loaders:
+            result, ms = timed(loader, filename)
+            loaded.append(result)
+            print(f"{n:>8} {edge_count(result[0]):>8} {mb:>7.1f} {name:>7} {ms / 1000:>8.2f} {mb / ms * 1000:>7.1f}")
+        for graph, *rest in loaded[1:]:
+            assert [(a, list(links.items())) for a, links in graph.graph_dict.items()] == \
+                [(a, list(links.items())) for a, links in loaded[0][0].graph_dict.items()]
+            assert list(graph.locations.items()) == list(loaded[0][0].locations.items()) and rest == list(loaded[0][1:])
+        del loaded
+    shutil.rmtree(directory)
+
+
+def bench_cache(n_nodes=(10000, 100000, 1000000)):
+    """Cold load (parsing the map file and writing its .graph.npz cache)
+    vs cached load of load_graph_from_file on grid map files, which must
+    give the same graph, links in the same order."""
+    directory = tempfile.mkdtemp()
+    print(f"{'nodes':>8} {'MB':>7} {'cache MB':>9} {'parse s':>8} {'cold s':>8} {'cached s':>9} {'speedup':>8}")
+    for n in n_nodes:
+        filename = os.path.join(directory, "map.txt")
+        graph, origin, destinations = grid_graph(n)
+        write_graph_file(graph, origin, destinations, filename)
+        del graph
+        parsed, parse_ms = timed(parse_graph_file, filename)
+        cold, cold_ms = timed(load_graph_from_file, filename)
+        cached, cached_ms = timed(load_graph_from_file, filename)
+        cache_file = pathfinding.graph.graph_cache_file(filename)
+        for graph, *rest in (cold, cached):
+            assert [(a, list(links.items())) for a, links in graph.graph_dict.items()] == \
+                [(a, list(links.items())) for a, links in parsed[0].graph_dict.items()]
+            assert list(graph.locations.items()) == list(parsed[0].locations.items()) and rest == list(parsed[1:])
+        print(f"{n:>8} {os.path.getsize(filename) / 2 ** 20:>7.1f} {os.path.getsize(cache_file) / 2 ** 20:>9.1f} "
+              f"{parse_ms / 1000:>8.2f} {cold_ms / 1000:>8.2f} {cached_ms / 1000:>9.2f} {parse_ms / cached_ms:>7.1f}x")
+        os.remove(cache_file)
+        del parsed, cold, cached
+    shutil.rmtree(directory)
+
+
+def write_mapped_grid(filename, side, seed=0, block=2 ** 20):
+    """Write a side x side grid as a mapped graph file, a block of rows at
+    a time, so graphs larger than memory can be made. Node r * side + c is
+    at (10c, 10r) and linked to its (up to) four neighbours with costs of
+    10 to 15, so the straight-line heuristic is admissible."""
+    rng = np.random.default_rng(seed)
+    n_nodes = side * side
+    arrays = pathfinding.graph.create_graph_file(filename, n_nodes, 4 * n_nodes - 4 * side, '<i4', '<i4')
+    arrays['offsets'][0] = 0
+    rows = max(1, block // side)
+    for r0 in range(0, side, rows):
+        r = np.arange(r0, min(r0 + rows, side)).repeat(side)
+        c = np.tile(np.arange(side), len(r) // side)
+        ids = r * side + c
+        neighbours = np.stack([ids + 1, ids - 1, ids + side, ids - side], axis=1)
+        linked = np.stack([c < side - 1, c > 0, r < side - 1, r > 0], axis=1)
+        start = arrays['offsets'][ids[0]]
+        targets = neighbours[linked]
+        arrays['label_array'][ids[0]:ids[-1] + 1] = ids
+        arrays['offsets'][ids[0] + 1:ids[-1] + 2] = start + np.cumsum(linked.sum(axis=1))
+        arrays['targets'][start:start + len(targets)] = targets
+        arrays['costs'][start:start + len(targets)] = rng.integers(10, 16, len(targets))
+        arrays['coords'][ids[0]:ids[-1] + 1] = np.stack([c * 10.0, r * 10.0], axis=1)
+    for array in arrays.values():
+        array.flush()
+
+
+def memory_status():
+    """Return the peak and current resident set size of this process and
+    the parts of it that are private (anonymous) and mapped from files,
+    in MB, from /proc/self/status (Linux only)."""
+    with open("/proc/self/status") as file:
+        status = dict(line.split(":", 1) for line in file)
+    return {key: int(status[key].split()[0]) / 1024 for key in ("VmHWM", "VmRSS", "RssAnon", "RssFile")}
+
+
+def mapped_grid_queries(filename, side, mode, n_queries, reach, seed=0):
+    """Open the grid in a mapped graph file (mode "mmap") or read its
+    arrays into memory (mode "read"), answer n_queries A* queries between
+    nodes up to reach rows and columns apart, and print the time taken
+    and the memory used. Run in a fresh process by bench_mmap, after the
+    file is dropped from the page cache (where the OS allows it)."""
+    if hasattr(os, "posix_fadvise"):
+        fd = os.open(filename, os.O_RDONLY)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        os.close(fd)
+    start = time.perf_counter()
+    if mode == "mmap":
+        graph = CSRGraph.open(filename)
+    else:
+        arrays = {name: np.array(array) for name, array in pathfinding.graph.map_graph_file(filename).items()}
+        graph = CSRGraph(arrays['label_array'], arrays['offsets'], arrays['targets'], arrays['costs'],
+                         arrays['coords'])
+    open_ms = (time.perf_counter() - start) * 1000
+    rng = random.Random(seed)
+    expanded = 0
+    start = time.perf_counter()
+    for _ in range(n_queries):
+        r, c = rng.randrange(side - reach), rng.randrange(side - reach)
+        origin, goal = r * side + c, (r + rng.randrange(reach)) * side + c + rng.randrange(reach)
+        node, expanded_here, _ = astar_search(GraphProblem(origin, [goal], graph, lazy_h=True))
+        assert node.state == goal
+        expanded += expanded_here
+    query_ms = (time.perf_counter() - start) * 1000 / n_queries
+    memory = memory_status()
+    print(f"{mode:>6} {open_ms:>9.1f} {query_ms:>9.1f} {expanded / n_queries:>9.0f} {memory['VmHWM']:>8.0f} "
+          f"{memory['RssAnon']:>8.0f} {memory['RssFile']:>8.0f}")
+
+
+def bench_mmap(side=6000, n_queries=20, reach=100, modes=("mmap", "read")):
+    """Generate a side x side grid (36M nodes and 2.3 GB by default) as a
+    mapped graph file, then, in a fresh process for each mode, open it
+    with CSRGraph.open or read it into memory and answer A* queries,
+    reporting the open time, query latency and peak resident memory
+    (VmHWM), split into private (RssAnon) and page cache (RssFile) MB."""
+    directory = tempfile.mkdtemp()
+    filename = os.path.join(directory, "grid.pfgraph")
+    _, ms = timed(write_mapped_grid, filename, side)
+    print(f"{side * side} nodes, {os.path.getsize(filename) / 2 ** 30:.2f} GB, written in {ms / 1000:.1f}s")
+    print(f"{'mode':>6} {'open ms':>9} {'query ms':>9} {'expanded':>9} {'peak MB':>8} {'anon MB':>8} {'file MB':>8}")
+    for mode in modes:
+        subprocess.run([sys.executable, "-c", f"import benchmark; benchmark.mapped_grid_queries("
+                        f"{filename!r}, {side}, {mode!r}, {n_queries}, {reach})"],
+                       cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+    shutil.rmtree(directory)
+
+
+def legacy_random_graph():
+    """random_path_generator.random_graph before it was vectorised: 5
+    nodes on an 11 x 11 grid, redrawn until distinct, and edges picked
+    with list comprehensions (returns the nodes and edges only)."""
+    nodes = {}
+    while len(nodes) < 5:
+        x, y = random.randint(0, 10), random.randint(0, 10)
+        if (x, y) not in list(nodes.values()):
+            nodes[len(nodes) + 1] = (x, y)
+    edges = {}
+    for node, (x0, y0) in nodes.items():
+        possible_nodes = [n for n in nodes if n != node and (node, n) not in edges and (n, node) not in edges]
+        random.shuffle(possible_nodes)
+        for connected_node in possible_nodes[:min(random.randint(0, 3), len(possible_nodes))]:
+            (x1, y1) = nodes[connected_node]
+            cost_forward = math.ceil(math.sqrt((x1 - x0) ** 2 + (y1 - y0) ** 2)) * 2
+            different_cost, directed = bool(random.getrandbits(1)), bool(random.getrandbits(1))
+            edges[(node, connected_node)] = cost_forward
+            if not directed:
+                edges[(connected_node, node)] = cost_forward if different_cost else cost_forward + 1
+    return nodes, edges
+
+
+def bench_generate(n_nodes=(10000, 100000, 1000000), neighbours=("random", "knn", "radius"), runs=1000):
+    """Time to generate random graphs with random_path_generator: the old
+    and new random_graph on 5 nodes (average of runs), then
+    random_graph_arrays and graph_text on graphs of n_nodes nodes for
+    each kind of neighbours (radius 3 for "radius")."""
+    _, legacy_ms = timed(lambda: [legacy_random_graph() for _ in range(runs)])
+    _, new_ms = timed(lambda: [random_path_generator.random_graph(seed=seed) for seed in range(runs)])
+    print(f"5 nodes: old random_graph {legacy_ms / runs:.3f} ms, new {new_ms / runs:.3f} ms (with the text)")
+    print(f"{'nodes':>8} {'neighbours':>10} {'links':>8} {'arrays s':>9} {'text s':>7} {'mean degree':>12}")
+    for n in n_nodes:
+        for kind in neighbours:
+            rng = np.random.default_rng(0)
+            arrays, ms = timed(lambda: random_path_generator.random_graph_arrays(
+                n, neighbours=kind, radius=3, max_destinations=3, rng=rng))
+            _, text_ms = timed(random_path_generator.graph_text, *arrays)
+            print(f"{n:>8} {kind:>10} {len(arrays[1]):>8} {ms / 1000:>9.2f} {text_ms / 1000:>7.2f} "
+                  f"{len(arrays[1]) / n:>12.2f}")
+
+
+def legacy_graph_text(coords, sources, targets, costs, origin, destinations):
+    """random_graph's text before the streaming writer: one string built
+    up with += a line at a time."""
+    text = "Nodes:\n"
+    for node, (x, y) in enumerate(coords.tolist(), 1):
+        text += f"{node}: ({x},{y})\n"
+    text += "Edges:\n"
+    for a, b, cost in zip(sources.tolist(), targets.tolist(), costs.tolist()):
+        text += f"({a},{b}): {cost}\n"
+    text += f"Origin:\n{origin}\n"
+    text += "Destinations:\n"
+    for dest in destinations:
+        text += f"{dest}; " if dest is not destinations[-1] else f"{dest}"
+    return text
+
+
+def legacy_export_graph(content, directory, base_name="test_"):
+    """export_graph before GraphExporter, which checked test_1.txt,
+    test_2.txt, ... until it found a free name, for every file."""
+    i = 1
+    while True:
+        filename = os.path.join(directory, f"{base_name}{i}.txt")
+        if not os.path.exists(filename):
+            with open(filename, "w") as file:
+                file.write(content)
+            break
+        i += 1
+    return filename
+
+
+def bench_export(n_graphs=5000, n_nodes=50, n_reads=1000, window=1000):
+    """Graphs per second written one per file by the old export_graph vs
+    GraphExporter, and into one graph container, over the first and the
+    last window graphs; then graphs per second read back by id from the
+    container vs from their own files."""
+    rng = np.random.default_rng(0)
+    graphs = [random_path_generator.random_graph_arrays(n_nodes, rng=rng) for _ in range(n_graphs)]
+    directory = tempfile.mkdtemp()
+    print(f"{n_graphs} graphs of {n_nodes} nodes")
+    print(f"{'writer':>16} {'first /s':>9} {'last /s':>9} {'total s':>8}")
+
+    def write_all(name, write):
+        times = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            for arrays in graphs:
+                start = time.perf_counter()
+                write(arrays)
+                times.append(time.perf_counter() - start)
+        print(f"{name:>16} {window / sum(times[:window]):>9.0f} {window / sum(times[-window:]):>9.0f} "
+              f"{sum(times):>8.2f}")
+
+    old_directory, new_directory = os.path.join(directory, "old"), os.path.join(directory, "new")
+    os.makedirs(old_directory)
+    os.makedirs(new_directory)
+    write_all("old", lambda arrays: legacy_export_graph(legacy_graph_text(*arrays), old_directory))
+    exporter = random_path_generator.GraphExporter(new_directory)
+    write_all("GraphExporter", lambda arrays: exporter.export(
+        lambda file: random_path_generator.write_graph(file, *arrays)))
+    container_file = os.path.join(directory, "maps.graphs")
+    with pathfinding.GraphContainerWriter(container_file) as container:
+        write_all("container", lambda arrays: container.add(
+            lambda file: random_path_generator.write_graph(file, *arrays)))
+
+    # Reading the bytes of a graph, which are then parsed the same way
+    ids = random.Random(0).sample(range(1, n_graphs + 1), n_reads)
+    files = [os.path.join(new_directory, f"test_{i}.txt") for i in ids]
+
+    def read_file(filename):
+        with open(filename, "rb") as file:
+            return file.read()
+    files_data, files_ms = timed(lambda: [read_file(file) for file in files])
+    with pathfinding.GraphContainer(container_file) as container:
+        container_data, container_ms = timed(lambda: [container.data(i) for i in ids])
+    assert container_data == files_data
+    _, parse_ms = timed(lambda: [pathfinding.parse_graph_data(data) for data in files_data])
+    print(f"read by id: {files_ms * 1000 / n_reads:.1f} us per graph from its file, "
+          f"{container_ms * 1000 / n_reads:.1f} us from the container (parsing: {parse_ms * 1000 / n_reads:.0f} us)")
+    shutil.rmtree(directory)
+
+
+def bench_bulk(sizes=((5, 5000), (1000, 500), (100000, 6)), workers=(2, 4)):
+    """Graphs per second generated as py random_path_generator.py
+    {n_graphs} -n {n_nodes} --seed 0 [-j N] does (with and without
+    --container), serially vs on a process pool, checking that every
+    number of workers writes the same bytes."""
+    print(f"{os.cpu_count()} CPUs")
+    print(f"{'nodes':>8} {'graphs':>7} {'output':>10} {'workers':>8} {'graphs/s':>9} {'speedup':>8}")
+    entropy = np.random.SeedSequence(0).entropy
+    for n_nodes, n_graphs in sizes:
+        options = (n_nodes, None, 3, "uniform", 0.5, 0.5, "random", None, None)
+        for output in ("files", "container"):
+            outputs = []
+            for n in (None, *workers):
+                directory = tempfile.mkdtemp()
+                if output == "files":
+                    exporter = random_path_generator.GraphExporter(directory)
+
+                    def write_all():
+                        filenames = (exporter.reserve() for _ in range(n_graphs))
+                        for _ in random_path_generator.generate_graphs(n_graphs, entropy, options, filenames,
+                                                                       workers=n):
+                            pass
+                else:
+                    def write_all():
+                        with pathfinding.GraphContainerWriter(os.path.join(directory, "maps.graphs")) as container:
+                            for data, _ in random_path_generator.generate_graphs(n_graphs, entropy, options,
+                                                                                 workers=n):
+                                container.add(data)
+                _, ms = timed(write_all)
+                if n is None:
+                    serial_ms = ms
+                contents = []
+                for name in sorted(os.listdir(directory)):
+                    with open(os.path.join(directory, name), "rb") as file:
+                        contents.append(file.read())
+                outputs.append(contents)
+                assert outputs[-1] == outputs[0]
+                shutil.rmtree(directory)
+                print(f"{n_nodes:>8} {n_graphs:>7} {output:>10} {n or 'serial':>8} {n_graphs * 1000 / ms:>9.1f} "
+                      f"{serial_ms / ms:>7.2f}x")
+
+
+def bench_startup(runs=5):
+    """Cold-start time of fresh Python processes (best of runs): importing
+    the search code, a --headless run, and the imports a GUI run adds
+    before it opens its window (the GUI itself needs a display)."""
+    commands = [("import pathfinding", [sys.executable, "-c", "import pathfinding"]),
+                ("headless run", [sys.executable, "path_finding_algorithms.py", "test_1.txt", "CUS1", "--headless"]),
+                ("GUI imports", [sys.executable, "-c", "import pathfinding, tkinter, graph_gui"]),
+                ("python -c pass", [sys.executable, "-c", "pass"])]
+    print(f"{'process':>32} {'ms':>7}")
+    for name, command in commands:
+        best = min(timed(lambda: subprocess.run(command, capture_output=True, check=True))[1] for _ in range(runs))
+        print(f"{name:>32} {best:>7.0f}")
+
+
+def import_time(module, runs=5):
+    """Return the cumulative import time of module in ms (best of runs)
+    and the modules it imported, from python -X importtime."""
+    best, imported = math.inf, []
+    for _ in range(runs):
+        stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                                capture_output=True, text=True, check=True).stderr
+        rows = [line.split("|") for line in stderr.splitlines() if line.startswith("import time:")][1:]
+        imported = [name.strip() for _, _, name in rows]
+        total = next(int(cumulative) for _, cumulative, name in rows if name.strip() == module) / 1000
+        best = min(best, total)
+    return best, imported
+
+
+def bench_importtime(modules=("pathfinding", "path_finding_algorithms", "utils", "graph_gui")):
+    """Import time of the pathfinding package vs the old entry points,
+    and whether each pulls in NumPy, matplotlib or Tk."""
+    print(f"{'module':>24} {'ms':>7} {'modules':>8} {'numpy':>6} {'matplotlib':>11} {'tkinter':>8}")
+    for module in modules:
+        ms, imported = import_time(module)
+        loaded = [any(name == heavy or name.startswith(heavy + ".") for name in imported)
+                  for heavy in ("numpy", "matplotlib", "tkinter")]
+        print(f"{module:>24} {ms:>7.1f} {len(imported):>8} " + " ".join(
+            f"{'yes' if flag else 'no':>{width}}" for flag, width in zip(loaded, (6, 11, 8))))
+
+
+BENCHMARKS = {
+    "pq": bench_priority_queue,
+    "ucs": bench_uniform_cost_search,
+    "uninformed": bench_uninformed_search,
+    "idastar": bench_iterative_deepening_astar_search,
+    "csr": bench_csr_graph,
+    "nodes": bench_nodes,
+    "heuristic": bench_heuristic,
+    "alt": bench_alt,
+    "bidirectional": bench_bidirectional,
+    "ch": bench_contraction_hierarchy,
+    "batch": bench_batch,
+    "distance": bench_distance_table,
+    "parallel": bench_parallel,
+    "stats": bench_stats,
+    "budget": bench_budget,
+    "anytime": bench_anytime,
+    "startup": bench_startup,
+    "importtime": bench_importtime,
+    "parse": bench_parse,
+    "cache": bench_cache,
+    "mmap": bench_mmap,
+    "generate": bench_generate,
+    "export": bench_export,
+    "bulk": bench_bulk,
+}
+
+if __name__ == "__main__":
+    BENCHMARKS[sys.argv[1]]()
@@ -0,0 +1,43 @@
+"""
+Path finding on graphs: the search algorithms, the graphs they run on and
+the tools built around them, importable without side effects.
+    from pathfinding import GraphProblem, astar_search, load_graph_from_file
+    graph, origin, destinations = load_graph_from_file('test_1.txt')
+    node, explored, runtime = astar_search(GraphProblem(origin, destinations, graph))
+NumPy is only imported once something needs it, and the GUI only by the
+command line (py -m pathfinding), when it draws.
+"""
+
+from .bidirectional import (bidirectional_astar_search, bidirectional_best_first_search,
+                            bidirectional_uniform_cost_search)
+from .graph import (CSRGraph, Graph, GraphContainer, GraphContainerWriter, GraphProblem, compile_graph_files,
+                    create_graph_file, load_graph_from_file, map_graph_file, parse_graph_data, parse_graph_file,
+                    shortest_path_costs)
+from .hierarchy import ContractionHierarchy, contraction_hierarchy_search
+from .landmarks import Landmarks, alt_search
+from .runner import (ALL_ALGORITHMS, PROFILE_MODES, load_queries_from_file, profile_algorithm, run_algorithm,
+                     shortest_path_tree_search, solve_batch, solve_file, solve_files)
+from .search import (BudgetExceeded, Node, Problem, SearchBudget, SearchStats, anytime_astar_search, astar_search,
+                     best_first_graph_search, breadth_first_graph_search, depth_first_graph_search,
+                     greedy_best_first_graph_search, iterative_deepening_astar_search, uniform_cost_search)
+from .tables import DistanceTable, distance_table, floyd_warshall
+
+__all__ = [
+    # Problems and search trees
+    'Problem', 'Node',
+    # Graphs
+    'Graph', 'CSRGraph', 'GraphProblem', 'load_graph_from_file', 'parse_graph_file', 'parse_graph_data',
+    'compile_graph_files', 'create_graph_file', 'map_graph_file', 'GraphContainer', 'GraphContainerWriter',
+    'shortest_path_costs',
+    # Searches
+    'depth_first_graph_search', 'breadth_first_graph_search', 'uniform_cost_search', 'best_first_graph_search',
+    'greedy_best_first_graph_search', 'astar_search', 'anytime_astar_search', 'iterative_deepening_astar_search',
+    'bidirectional_best_first_search', 'bidirectional_uniform_cost_search', 'bidirectional_astar_search',
+    'Landmarks', 'alt_search', 'ContractionHierarchy', 'contraction_hierarchy_search', 'SearchStats',
+    'SearchBudget', 'BudgetExceeded',
+    # Running searches by name, in batches and on files
+    'ALL_ALGORITHMS', 'run_algorithm', 'PROFILE_MODES', 'profile_algorithm', 'load_queries_from_file',
+    'shortest_path_tree_search', 'solve_batch', 'solve_file', 'solve_files',
+    # Distance tables
+    'DistanceTable', 'distance_table', 'floyd_warshall',
+]
@@ -0,0 +1,4 @@
+from .cli import runGraphSeacrh
+
+if __name__ == "__main__":
+    runGraphSeacrh()
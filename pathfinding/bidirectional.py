@@ -0,0 +1,127 @@
+"""
+Bidirectional search: Dijkstra and A* from both ends at once.
+"""
+
+import heapq
+import math
+import time
+
+from .graph import GraphProblem
+from .search import Node
+
+
+# ______________________________________________________________________________
+# Bidirectional Search
+
+
+def bidirectional_best_first_search(problem, potential=None, stats=None, budget=None):
+    """Search forwards from problem.initial and backwards from every goal
+    at once (as if from a virtual sink that every goal links to at no
+    cost), always expanding the side whose best frontier key is lower.
+    Keys are g + potential(state) going forwards and g - potential(state)
+    going backwards; with no potential both are bidirectional Dijkstra.
+    mu is the cost of the best path through a state reached from both
+    sides, and the search stops once the two best keys add up to mu or
+    more, when no better path can be left. The backward side follows the
+    graph's reverse links, which are built once and kept on the graph as
+    reverse_index. Counts are added to stats, a SearchStats, and the search
+    stops at the limits of budget, a SearchBudget, if given; the frontier
+    and explored sizes are those of both sides together, and the
+    potential's calls are its heuristic evaluations."""
+    start_time = time.perf_counter()
+    graph = problem.graph
+    reverse = getattr(graph, 'reverse_index', None)
+    if reverse is None:
+        reverse = graph.reverse_index = graph.reverse()
+    goals = problem.goal if isinstance(problem.goal, frozenset) else [problem.goal]
+    if problem.goal_test(problem.initial):
+        return Node(problem.initial), 0, (time.perf_counter() - start_time) * 1000
+    if potential is None:
+        potential = lambda state: 0
+    elif stats is not None:
+        potential = stats.counted(potential)
+
+    # One entry per direction: [links, sign of the potential, frontier,
+    # best g, parent state (towards the origin or the goals), explored]
+    forward = [graph, 1, [(potential(problem.initial), problem.initial)],
+               {problem.initial: 0}, {problem.initial: None}, set()]
+    backward = [reverse, -1, [(-potential(goal), goal) for goal in goals],
+                {goal: 0 for goal in goals}, {goal: None for goal in goals}, set()]
+    heapq.heapify(backward[2])
+    mu, meeting = math.inf, None
+    nodes_expanded = 0
+    check_at = math.inf if budget is None else budget.next_check(0)
+
+    while forward[2] and backward[2]:
+        for side in (forward, backward):
+            frontier, explored = side[2], side[5]
+            while frontier and frontier[0][1] in explored:
+                heapq.heappop(frontier)  # Stale entry
+        if not forward[2] or not backward[2] or forward[2][0][0] + backward[2][0][0] >= mu:
+            break
+
+        side, other = (forward, backward) if forward[2][0][0] <= backward[2][0][0] else (backward, forward)
+        links, sign, frontier, best_g, parent, explored = side
+        if stats is not None:
+            stats.observe(len(forward[2]) + len(backward[2]), len(forward[5]) + len(backward[5]))
+        _, a = heapq.heappop(frontier)
+        explored.add(a)
+        nodes_expanded += 1
+        if nodes_expanded >= check_at:
+            check_at = budget.check(nodes_expanded, len(forward[2]) + len(backward[2]),
+                                    len(forward[5]) + len(backward[5]), start_time, stats)
+        children = links.get(a)
+        if stats is not None:
+            stats.expanded += 1
+            stats.generated += len(children)
+            stats.pruned += len(children)  # Less the ones pushed below
+        for b, dist in children.items():
+            g = best_g[a] + dist
+            if g < best_g.get(b, math.inf):
+                if stats is not None:
+                    stats.pruned -= 1
+                    if b in best_g:
+                        stats.decrease_keys += 1
+                best_g[b] = g
+                parent[b] = a
+                heapq.heappush(frontier, (g + sign * potential(b), b))
+                if b in other[3] and g + other[3][b] < mu:
+                    mu, meeting = g + other[3][b], b
+
+    if meeting is None:
+        return None, nodes_expanded, (time.perf_counter() - start_time) * 1000
+
+    # Walk back to the origin, then forwards to the goal, building Nodes
+    states = [meeting]
+    while forward[4][states[-1]] is not None:
+        states.append(forward[4][states[-1]])
+    states.reverse()
+    while backward[4][states[-1]] is not None:
+        states.append(backward[4][states[-1]])
+    node = Node(states[0])
+    for state in states[1:]:
+        node = node.child_node(problem, state)
+    return node, nodes_expanded, (time.perf_counter() - start_time) * 1000
+
+
+def bidirectional_uniform_cost_search(problem, stats=None, budget=None):
+    """Bidirectional Dijkstra: uniform cost search from both ends."""
+    return bidirectional_best_first_search(problem, stats=stats, budget=budget)
+
+
+def bidirectional_astar_search(problem, h=None, stats=None, budget=None):
+    """Bidirectional A* with the average of the forward heuristic h (to the
+    goals) and a backward one (straight-line distance from the origin) as
+    the potential, which keeps both sides consistent so the stopping rule
+    of bidirectional Dijkstra still holds. Falls back to bidirectional
+    Dijkstra when the graph has no locations. h takes a Node, like the h of
+    astar_search (e.g. Landmarks.heuristic), and must be consistent."""
+    if not getattr(problem.graph, 'locations', None):
+        return bidirectional_best_first_search(problem, stats=stats, budget=budget)
+    if h is None:
+        h = problem.h  # Which takes a state as well, without building a Node for it
+    else:
+        h = lambda state, node_h=h: node_h(Node(state))
+    from_origin = GraphProblem(None, problem.initial, problem.graph, lazy_h=True)
+    return bidirectional_best_first_search(problem, lambda state: (h(state) - from_origin.h(state)) / 2, stats,
+                                           budget)
@@ -0,0 +1,124 @@
+"""
+The command line: py -m pathfinding {file | -a} {method | -a} [-j N] [--headless] [--stats]
+                                    [--profile [cpu | memory]] [--max-expansions N] [--time-limit S]
+                                    [--max-frontier N] [--max-explored N]
+                  py -m pathfinding compile [directory]
+"""
+
+import glob
+import sys
+
+from .graph import GraphProblem, compile_graph_files, load_graph_from_file
+from .runner import ALL_ALGORITHMS, PROFILE_MODES, prepare_graph, solve_files, solve_problem
+from .search import SearchBudget, SearchStats
+
+# The command line options of SearchBudget's limits: (option, limit, type)
+BUDGET_OPTIONS = [("--max-expansions", "max_expansions", int), ("--time-limit", "time_limit", float),
+                  ("--max-frontier", "max_frontier", int), ("--max-explored", "max_explored", int)]
+
+
+def open_gui():
+    """Create the Tk window and its GraphGUI. Tk and matplotlib are only
+    imported here, so runs that draw nothing never load them."""
+    import tkinter as tk
+    from graph_gui import GraphGUI
+    root = tk.Tk()
+    return root, GraphGUI(root)
+
+
+def runGraphSeacrh():
+    # Load file(s) and method from CLI, the number of worker processes from
+    # -j N (if given, the runs are done in parallel and drawn at the end),
+    # --headless to only print the results, without any GUI, --stats to
+    # also print each search's SearchStats, --profile (cpu or memory,
+    # default both) to profile each search into {name}.{method}.* files,
+    # and --max-expansions, --time-limit (seconds), --max-frontier and
+    # --max-explored to stop each search at those limits
+    args = sys.argv[1:]
+    if args[0] == "compile":
+        # Write the binary cache of every map in a directory (default: this one)
+        compile_graph_files(args[1] if len(args) > 1 else ".")
+        return
+    headless = "--headless" in args
+    if headless:
+        args.remove("--headless")
+    show_stats = "--stats" in args
+    if show_stats:
+        args.remove("--stats")
+    profile = None
+    if "--profile" in args:
+        i = args.index("--profile")
+        profile = PROFILE_MODES
+        if i + 1 < len(args) and args[i + 1] in PROFILE_MODES:
+            profile = (args.pop(i + 1),)
+        del args[i]
+    workers = None
+    if "-j" in args:
+        i = args.index("-j")
+        workers = int(args[i + 1])
+        del args[i:i + 2]
+    limits = {}
+    for option, name, kind in BUDGET_OPTIONS:
+        if option in args:
+            i = args.index(option)
+            limits[name] = kind(args[i + 1])
+            del args[i:i + 2]
+    budget = SearchBudget(**limits) if limits else None
+    method = args[1]
+    filenames = glob.glob("*.txt") if args[0] == "-a" else [args[0]]
+    algorithms_to_run = ALL_ALGORITHMS if method == "-a" else [method]
+
+    if workers is not None:
+        jobs = [(file, algo) for file in filenames for algo in algorithms_to_run]
+        results = []
+        for (file, algo), result in zip(jobs, solve_files(jobs, workers, show_stats, profile, budget)):
+            final_node, explored, path_cost, runtime, path = result[:5]
+            print(f"{file} {algo}\n{final_node} {explored} {path_cost}\n{runtime:.2f}ms\n{path}")
+            if show_stats:
+                print(result[5])
+            results.append(((file, algo), result[:5]))
+        if headless:
+            return
+
+        # Build the GUI pages once every result is in
+        root, app = open_gui()
+        maps = {}
+        for (file, algo), (final_node, explored, path_cost, runtime, path) in results:
+            if file not in maps:
+                maps[file] = load_graph_from_file(file)
+            graph_map, origin, dest = maps[file]
+            title = f"Solutions for {file.removesuffix('.txt')} based on {algo}"
+            metrics = {"nodes_explored": explored, "runtime": runtime, "algorithm": algo}
+            app.draw_solution(graph_map, origin, dest, path, title, metrics)
+        root.protocol("WM_DELETE_WINDOW", app.on_closing)
+        root.mainloop()
+        return
+
+    # Init GUI
+    if not headless:
+        root, app = open_gui()
+
+    for file in filenames:
+        graph_map, origin, dest = load_graph_from_file(file)
+        problem = GraphProblem(origin, dest, graph_map)
+
+        for algo in algorithms_to_run:
+            prepare_graph(graph_map, file, algo)
+            stats = SearchStats() if show_stats else None
+            final_node, explored, path_cost, runtime, path = solve_problem(algo, problem, file, stats, budget, profile)
+            
+            print(f"{file} {algo}\n{final_node} {explored} {path_cost}\n{runtime:.2f}ms\n{path}")
+            if show_stats:
+                print(stats)
+
+            if not headless:
+                title = f"Solutions for {file.removesuffix('.txt')} based on {algo}"
+                metrics = {"nodes_explored": explored, "runtime": runtime, "algorithm": algo}
+                app.draw_solution(graph_map, origin, dest, path, title, metrics)
+
+    if headless:
+        return
+
+    # Graceful exit
+    root.protocol("WM_DELETE_WINDOW", app.on_closing)
+    root.mainloop()
@@ -0,0 +1,918 @@
+"""
+Graphs, the frozen CSR graph, the map file loader and GraphProblem.
+"""
+
+import contextlib
+import glob
+import heapq
+import math
+import mmap
+import os
+import re
+import struct
+import time
+import zipfile
+from collections.abc import Mapping, Sequence
+
+from .search import Node, Problem
+from .utils import np
+
+
+# ______________________________________________________________________________
+# Graphs and Graph Problems
+
+
+class Graph:
+    """A graph connects nodes (vertices) by edges (links). Each edge can also
+    have a length associated with it. The constructor call is something like:
+        g = Graph({'A': {'B': 1, 'C': 2})
+    this makes a graph with 3 nodes, A, B, and C, with an edge of length 1 from
+    A to B,  and an edge of length 2 from A to C. You can also do:
+        g = Graph({'A': {'B': 1, 'C': 2}, directed=False)
+    This makes an undirected graph, so inverse links are also added. The graph
+    stays undirected; if you add more links with g.connect('B', 'C', 3), then
+    inverse link is also added. You can use g.nodes() to get a list of nodes,
+    g.get('A') to get a dict of links out of A, and g.get('A', 'B') to get the
+    length of the link from A to B. 'Lengths' can actually be any object at
+    all, and nodes can be any hashable object."""
+
+    def __init__(self, graph_dict=None, directed=True):
+        self.graph_dict = graph_dict or {}
+        self.directed = directed
+        if not directed:
+            self.make_undirected()
+
+    def make_undirected(self):
+        """Make a digraph into an undirected graph by adding symmetric edges."""
+        for a in list(self.graph_dict.keys()):
+            for (b, dist) in self.graph_dict[a].items():
+                self.connect1(b, a, dist)
+
+    def connect(self, A, B, distance=1):
+        """Add a link from A and B of given distance, and also add the inverse
+        link if the graph is undirected."""
+        self.connect1(A, B, distance)
+        if not self.directed:
+            self.connect1(B, A, distance)
+
+    def connect1(self, A, B, distance):
+        """Add a link from A to B of given distance, in one direction only."""
+        self.graph_dict.setdefault(A, {})[B] = distance
+
+    def get(self, a, b=None):
+        """Return a link distance or a dict of {node: distance} entries.
+        .get(a,b) returns the distance or None;
+        .get(a) returns a dict of {node: distance} entries, possibly {}."""
+        links = self.graph_dict.setdefault(a, {})
+        if b is None:
+            return links
+        else:
+            return links.get(b)
+
+    def nodes(self):
+        """Return a list of nodes in the graph."""
+        s1 = set([k for k in self.graph_dict.keys()])
+        s2 = set([k2 for v in self.graph_dict.values() for k2, v2 in v.items()])
+        nodes = s1.union(s2)
+        return list(nodes)
+
+    def freeze(self):
+        """Return a read-only CSRGraph with the same links and locations."""
+        return CSRGraph.from_graph(self)
+
+    def reverse(self):
+        """Return a new Graph with every link turned around, for searching
+        backwards from a node."""
+        reverse = Graph()
+        for a, links in self.graph_dict.items():
+            for b, dist in links.items():
+                reverse.connect1(b, a, dist)
+        if hasattr(self, 'locations'):
+            reverse.locations = self.locations
+        return reverse
+
+
+class CSRGraph:
+    """A frozen graph stored in compressed sparse row (CSR) form. Nodes are
+    numbered 0..n-1 in the order of labels (sorted, if they are all ints;
+    a range of ints needs no label index), and the links out of node i are
+    targets[offsets[i]:offsets[i + 1]] with lengths in the same slice of
+    costs. The (x, y) location of node i is coords[i]. offsets, targets,
+    costs and coords are NumPy arrays, which take a few bytes per link
+    instead of the few hundred of a dict entry.
+        g = Graph({'A': {'B': 1, 'C': 2}}).freeze()
+    A CSRGraph answers g.nodes(), g.get('A') and g.get('A', 'B') like a
+    Graph, and g.graph_dict and g.locations are read-only views of the
+    arrays, so GraphProblem and the search functions run on it unchanged.
+    Links keep the order they had in the Graph."""
+
+    def __init__(self, labels, offsets, targets, costs, coords=None):
+        if isinstance(labels, np.ndarray):
+            # Sorted int labels in an array (such as a memory-mapped one) are
+            # used as they are, and looked up in it by binary search
+            self.label_array = labels
+            labels = SortedLabels(labels)
+            if len(labels) and labels[-1] - labels[0] == len(labels) - 1:
+                labels = range(labels[0], labels[-1] + 1)
+                self.index = RangeIndex(labels)
+            else:
+                self.index = SortedIndex(labels)
+        else:
+            if not isinstance(labels, range):
+                labels = list(labels)
+            if labels and all(type(label) is int for label in labels):
+                self.label_array = np.array(labels, dtype=np.int64)
+                base = labels[0]
+                if np.array_equal(self.label_array, np.arange(base, base + len(labels))):
+                    # Node i is labelled base + i, so no label index is needed
+                    labels = range(base, base + len(labels))
+                    self.index = RangeIndex(labels)
+            else:
+                self.label_array = np.empty(len(labels), dtype=object)
+                self.label_array[:] = labels
+            if not isinstance(labels, range):
+                self.index = {label: i for i, label in enumerate(labels)}
+        self.labels = labels
+        self.offsets = offsets
+        self.targets = targets
+        self.costs = costs
+        self.coords = coords
+        self.directed = True
+        self.graph_dict = CSRLinks(self)
+        if coords is not None:
+            self.locations = CSRLocations(self)
+        self.last_links = (None, {})
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Build a CSRGraph from a Graph (or anything with a graph_dict of
+        {node: {node: distance}} and optional locations)."""
+        labels = list(graph.graph_dict)
+        seen = set(labels)
+        for links in graph.graph_dict.values():
+            for b in links:
+                if b not in seen:
+                    seen.add(b)
+                    labels.append(b)
+        locations = getattr(graph, 'locations', None) or {}
+        for a in locations:
+            if a not in seen:
+                seen.add(a)
+                labels.append(a)
+        if all(type(label) is int for label in labels):
+            labels.sort()
+        index = {label: i for i, label in enumerate(labels)}
+
+        no_links = {}
+        rows = [graph.graph_dict.get(a, no_links) for a in labels]
+        offsets = np.zeros(len(labels) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(links) for links in rows])
+        n_links = int(offsets[-1])
+        target_type = np.int32 if len(labels) < 2 ** 31 else np.int64
+        targets = np.fromiter((index[b] for links in rows for b in links),
+                              dtype=target_type, count=n_links)
+        lengths = [d for links in rows for d in links.values()]
+        cost_type = np.int64 if all(type(d) is int for d in lengths) else np.float64
+        costs = np.array(lengths, dtype=cost_type)
+
+        coords = None
+        if locations:
+            coords = np.full((len(labels), 2), np.nan)
+            for a, xy in locations.items():
+                coords[index[a]] = xy
+        return cls(labels, offsets, targets, costs, coords)
+
+    def freeze(self):
+        return self
+
+    def save(self, filename):
+        """Save the graph as a mapped graph file (see create_graph_file),
+        which CSRGraph.open maps back without reading it. Its labels must be
+        sorted ints, as from_graph leaves int labels."""
+        if self.label_array.dtype == object or np.any(np.diff(self.label_array) <= 0):
+            raise ValueError("only graphs with sorted int labels can be saved")
+        arrays = create_graph_file(filename, len(self.labels), len(self.targets), self.targets.dtype,
+                                   self.costs.dtype, self.coords is not None)
+        for name, array in arrays.items():
+            array[:] = getattr(self, name)
+        for array in arrays.values():
+            array.flush()
+
+    @classmethod
+    def open(cls, filename):
+        """Return the CSRGraph in a mapped graph file. The file is mapped
+        into memory read-only rather than read, so opening it takes the same
+        time whatever its size: parts of it are only read from disk when a
+        search looks at them, and processes that open the same file share
+        those pages in the OS page cache."""
+        arrays = map_graph_file(filename)
+        return cls(arrays['label_array'], arrays['offsets'], arrays['targets'], arrays['costs'], arrays.get('coords'))
+
+    def reverse(self):
+        """Return a new CSRGraph with every link turned around, for
+        searching backwards from a node."""
+        sources = np.repeat(np.arange(len(self.labels), dtype=self.targets.dtype), np.diff(self.offsets))
+        order = np.argsort(self.targets, kind='stable')
+        offsets = np.zeros_like(self.offsets)
+        offsets[1:] = np.cumsum(np.bincount(self.targets, minlength=len(self.labels)))
+        labels = self.label_array if isinstance(self.labels, SortedLabels) else self.labels
+        return CSRGraph(labels, offsets, sources[order], self.costs[order], self.coords)
+
+    def links(self, i):
+        """Return the node ids and lengths of the links out of node id i."""
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return self.targets[start:end], self.costs[start:end]
+
+    def get(self, a, b=None):
+        """Return a link distance or a dict of {node: distance} entries.
+        .get(a,b) returns the distance or None;
+        .get(a) returns a dict of {node: distance} entries, possibly {}."""
+        # The links of the last node asked for are kept as a dict, since a
+        # search looks up each of them right after expanding the node.
+        last, links = self.last_links
+        if a != last:
+            i = self.index.get(a)
+            if i is None:
+                return {} if b is None else None
+            targets, costs = self.links(i)
+            links = dict(zip(self.label_array[targets].tolist(), costs.tolist()))
+            self.last_links = (a, links)
+        if b is None:
+            return links
+        return links.get(b)
+
+    def nodes(self):
+        """Return a list of nodes in the graph."""
+        return list(self.labels)
+
+    def nbytes(self):
+        """Return the number of bytes held by the arrays."""
+        arrays = [self.offsets, self.targets, self.costs, self.label_array]
+        if self.coords is not None:
+            arrays.append(self.coords)
+        return sum(a.nbytes for a in arrays)
+
+
+class RangeIndex(Mapping):
+    """Read-only {label: id} view for nodes labelled by a range of ints."""
+
+    def __init__(self, labels):
+        self.labels = labels
+
+    def __getitem__(self, label):
+        if type(label) is not int or label not in self.labels:
+            raise KeyError(label)
+        return label - self.labels.start
+
+    def __iter__(self):
+        return iter(self.labels)
+
+    def __len__(self):
+        return len(self.labels)
+
+
+class SortedLabels(Sequence):
+    """Read-only sequence of the labels in a sorted array of ints, giving
+    them as Python ints."""
+
+    def __init__(self, array):
+        self.array = array
+
+    def __getitem__(self, i):
+        return int(self.array[i])
+
+    def __len__(self):
+        return len(self.array)
+
+    def __iter__(self, chunk=2 ** 16):
+        for i in range(0, len(self.array), chunk):
+            yield from self.array[i:i + chunk].tolist()
+
+
+class SortedIndex(Mapping):
+    """Read-only {label: id} view for nodes labelled by SortedLabels,
+    found by binary search in the array."""
+
+    def __init__(self, labels):
+        self.labels = labels
+
+    def __getitem__(self, label):
+        array = self.labels.array
+        i = int(np.searchsorted(array, label)) if type(label) is int else len(array)
+        if i == len(array) or array[i] != label:
+            raise KeyError(label)
+        return i
+
+    def __iter__(self):
+        return iter(self.labels)
+
+    def __len__(self):
+        return len(self.labels)
+
+
+class CSRLinks(Mapping):
+    """Read-only {node: {node: distance}} view of a CSRGraph, with an entry
+    for every node that has links out of it (like Graph.graph_dict)."""
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __getitem__(self, a):
+        links = self.graph.get(a)
+        if not links:
+            raise KeyError(a)
+        return links
+
+    def __iter__(self):
+        offsets = self.graph.offsets
+        for i in np.flatnonzero(offsets[1:] > offsets[:-1]).tolist():
+            yield self.graph.labels[i]
+
+    def __len__(self):
+        offsets = self.graph.offsets
+        return int(np.count_nonzero(offsets[1:] > offsets[:-1]))
+
+
+class CSRLocations(Mapping):
+    """Read-only {node: (x, y)} view of the coords of a CSRGraph, with an
+    entry for every node that has a location."""
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __getitem__(self, a):
+        xy = self.graph.coords[self.graph.index[a]]
+        if np.isnan(xy[0]):
+            raise KeyError(a)
+        return tuple(xy.tolist())
+
+    def __iter__(self):
+        for i in np.flatnonzero(~np.isnan(self.graph.coords[:, 0])).tolist():
+            yield self.graph.labels[i]
+
+    def __len__(self):
+        return int(np.count_nonzero(~np.isnan(self.graph.coords[:, 0])))
+
+    def __bool__(self):
+        # Without counting them, which would read every location of a mapped graph
+        return len(self.graph.coords) > 0
+
+
+# A mapped graph file is a header, then the arrays of a CSRGraph, each
+# starting at a multiple of MAPPED_GRAPH_ALIGN bytes, all little-endian:
+#   label_array  int64[nodes]      sorted node labels
+#   offsets      int64[nodes + 1]
+#   targets      targets[links]    int32 or int64
+#   costs        costs[links]      int32, int64 or float64
+#   coords       float64[nodes, 2] if the header says it has coordinates
+# The header holds the magic, the version, whether there are coordinates,
+# the node and link counts and the target and cost dtypes, e.g. b'<i4'.
+MAPPED_GRAPH_MAGIC = b'PFGRAPH\x00'
+MAPPED_GRAPH_VERSION = 1
+MAPPED_GRAPH_HEADER = struct.Struct('<8sIIQQ4s4s')
+MAPPED_GRAPH_ALIGN = 64
+
+
+def mapped_graph_layout(n_nodes, n_links, target_type, cost_type, has_coords):
+    """Return [(name, dtype, shape, offset)] for the arrays of a mapped
+    graph file, and the size of the file."""
+    shapes = [('label_array', '<i8', (n_nodes,)), ('offsets', '<i8', (n_nodes + 1,)),
+              ('targets', target_type, (n_links,)), ('costs', cost_type, (n_links,))]
+    if has_coords:
+        shapes.append(('coords', '<f8', (n_nodes, 2)))
+    layout = []
+    end = MAPPED_GRAPH_HEADER.size
+    for name, dtype, shape in shapes:
+        start = -(-end // MAPPED_GRAPH_ALIGN) * MAPPED_GRAPH_ALIGN
+        layout.append((name, np.dtype(dtype), shape, start))
+        end = start + np.dtype(dtype).itemsize * math.prod(shape)
+    return layout, end
+
+
+def create_graph_file(filename, n_nodes, n_links, target_type='<i4', cost_type='<i8', has_coords=True):
+    """Create a mapped graph file for n_nodes nodes and n_links links and
+    return {name: writable array} for its arrays, mapped from the file, to
+    be filled in (a block at a time, for graphs larger than memory) and
+    flushed. Labels must be filled in sorted."""
+    target_type = np.dtype(target_type).newbyteorder('<')
+    cost_type = np.dtype(cost_type).newbyteorder('<')
+    layout, size = mapped_graph_layout(n_nodes, n_links, target_type, cost_type, has_coords)
+    with open(filename, 'wb') as file:
+        file.write(MAPPED_GRAPH_HEADER.pack(MAPPED_GRAPH_MAGIC, MAPPED_GRAPH_VERSION, has_coords, n_nodes, n_links,
+                                            target_type.str.encode(), cost_type.str.encode()))
+        file.truncate(size)
+    return {name: np.memmap(filename, dtype, 'r+', offset, shape) for name, dtype, shape, offset in layout}
+
+
+def map_graph_file(filename):
+    """Map a mapped graph file into memory read-only and return {name:
+    array} for its arrays, which are views of the mapping (nothing is
+    read or copied until they are used)."""
+    with open(filename, 'rb') as file:
+        header = file.read(MAPPED_GRAPH_HEADER.size)
+        if len(header) < MAPPED_GRAPH_HEADER.size:
+            raise ValueError(f"{filename} is not a mapped graph file")
+        magic, version, has_coords, n_nodes, n_links, target_type, cost_type = MAPPED_GRAPH_HEADER.unpack(header)
+        if magic != MAPPED_GRAPH_MAGIC:
+            raise ValueError(f"{filename} is not a mapped graph file")
+        if version != MAPPED_GRAPH_VERSION:
+            raise ValueError(f"{filename} is a version {version} mapped graph file, not {MAPPED_GRAPH_VERSION}")
+        layout, size = mapped_graph_layout(n_nodes, n_links, target_type.rstrip(b'\0').decode(),
+                                            cost_type.rstrip(b'\0').decode(), has_coords)
+        if os.fstat(file.fileno()).st_size < size:
+            raise ValueError(f"{filename} is truncated")
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if hasattr(mmap, 'MADV_RANDOM'):
+        # A search reads a few links here and there, so read ahead no more than the page asked for
+        buffer.madvise(mmap.MADV_RANDOM)
+    return {name: np.frombuffer(buffer, dtype, math.prod(shape), offset).reshape(shape)
+            for name, dtype, shape, offset in layout}
+
+
+def shortest_path_costs(graph, sources):
+    """Return {node: cost of the cheapest path to it from any of sources}
+    for every node reachable in graph (Dijkstra's algorithm)."""
+    costs = {}
+    frontier = [(0, source) for source in sources]
+    heapq.heapify(frontier)
+    while frontier:
+        cost, a = heapq.heappop(frontier)
+        if a in costs:
+            continue
+        costs[a] = cost
+        for b, dist in graph.get(a).items():
+            if b not in costs:
+                heapq.heappush(frontier, (cost + dist, b))
+    return costs
+
+
+# Section headers of a map file, each on a line of its own
+MAP_SECTIONS = re.compile(rb'^[^\S\n]*(Nodes|Edges|Origin|Destinations):[^\S\n]*$', re.MULTILINE)
+# Punctuation in `1: (4,10)` and `(1,4): 14` records, read as spaces
+MAP_PUNCTUATION = bytes.maketrans(b'():,', b'    ')
+
+
+# Version of the .graph.npz cache layout; caches of other versions are rebuilt
+GRAPH_CACHE_VERSION = 1
+# Maps at least this large get a cache written next to them when loaded
+GRAPH_CACHE_MIN_BYTES = 2 ** 20
+
+
+def load_graph_from_file(filename, cache=True, graph_id=None):
+    """Read a map file and return (graph, origin, destinations). With
+    cache, the graph is loaded from the {name}.graph.npz cache next to the
+    file if there is one for the file's current size and modification
+    time; otherwise the file is parsed, and a cache is written for it if
+    it is at least GRAPH_CACHE_MIN_BYTES (py -m pathfinding compile writes
+    them for every map in a directory). With graph_id, filename is a
+    graph container and the graph with that id is read from it (see
+    GraphContainer)."""
+    if graph_id is not None:
+        with GraphContainer(filename) as container:
+            return container[graph_id]
+    if cache:
+        cached = load_graph_cache(filename)
+        if cached is not None:
+            return cached
+    graph_map, origin, destinations = parse_graph_file(filename)
+    if cache and os.path.getsize(filename) >= GRAPH_CACHE_MIN_BYTES:
+        save_graph_cache(filename, graph_map, origin, destinations)
+    return graph_map, origin, destinations
+
+
+def graph_cache_file(filename):
+    return os.path.splitext(filename)[0] + '.graph.npz'
+
+
+def save_graph_cache(filename, graph, origin, destinations):
+    """Save what load_graph_from_file(filename) returned to its cache file:
+    the links in CSR form (graph_dict keys, offsets, targets and costs),
+    the located nodes and their coordinates in order, the origin and
+    destinations, and the version, size and modification time of the map
+    file. Return the cache file name, or None if the graph cannot be
+    cached (its locations differ in length) or the cache is not writable."""
+    sources = list(graph.graph_dict)
+    rows = list(graph.graph_dict.values())
+    offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(links) for links in rows])
+    lengths = [d for links in rows for d in links.values()]
+    try:
+        coords = np.array(list(graph.locations.values()), dtype=np.float64).reshape(len(graph.locations), -1)
+    except ValueError:
+        return None
+    stat = os.stat(filename)
+    cache_file = graph_cache_file(filename)
+    partial_file = f'{cache_file}.{os.getpid()}.tmp'
+    try:
+        # Written under another name first, so a reader never sees half a cache
+        with open(partial_file, 'wb') as file:
+            np.savez(file, version=GRAPH_CACHE_VERSION, source=np.array([stat.st_size, stat.st_mtime_ns]),
+                     sources=np.array(sources, dtype=np.int64), offsets=offsets,
+                     targets=np.array([b for links in rows for b in links], dtype=np.int64),
+                     costs=np.array(lengths, dtype=np.int64 if all(type(d) is int for d in lengths) else np.float64),
+                     nodes=np.array(list(graph.locations), dtype=np.int64), coords=coords,
+                     origin=np.array([] if origin is None else [origin], dtype=np.int64),
+                     destinations=np.array(destinations, dtype=np.int64))
+        os.replace(partial_file, cache_file)
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.remove(partial_file)
+        return None
+    return cache_file
+
+
+def load_graph_cache(filename):
+    """Return (graph, origin, destinations) from the cache file of a map
+    file, or None if there is none, or it was made by another version or
+    for another size or modification time of the map file."""
+    cache_file = graph_cache_file(filename)
+    try:
+        stat = os.stat(filename)
+        data = np.load(cache_file)
+    except (OSError, ValueError, zipfile.BadZipFile):  # No cache, or a damaged one
+        return None
+    with data:
+        if ('version' not in data or data['version'] != GRAPH_CACHE_VERSION
+                or data['source'].tolist() != [stat.st_size, stat.st_mtime_ns]):
+            return None
+        sources, offsets = data['sources'].tolist(), data['offsets'].tolist()
+        targets, costs = data['targets'].tolist(), data['costs'].tolist()
+        graph_map = Graph({a: dict(zip(targets[offsets[i]:offsets[i + 1]], costs[offsets[i]:offsets[i + 1]]))
+                           for i, a in enumerate(sources)})
+        graph_map.locations = dict(zip(data['nodes'].tolist(), data['coords'].tolist()))
+        origin = data['origin'].tolist()
+        return graph_map, origin[0] if origin else None, data['destinations'].tolist()
+
+
+def compile_graph_files(directory='.', pattern='*.txt'):
+    """Parse every map file matching pattern in directory and write its
+    cache file, printing how long each took to parse and to load back.
+    Files with no nodes (not maps) are skipped. Return the cache files."""
+    cache_files = []
+    for filename in sorted(glob.glob(os.path.join(directory, pattern))):
+        start = time.perf_counter()
+        graph_map, origin, destinations = parse_graph_file(filename)
+        parse_time = (time.perf_counter() - start) * 1000
+        if not graph_map.locations:
+            continue
+        cache_file = save_graph_cache(filename, graph_map, origin, destinations)
+        if cache_file is None:
+            print(f"{filename}: not cached")
+            continue
+        start = time.perf_counter()
+        load_graph_cache(filename)
+        load_time = (time.perf_counter() - start) * 1000
+        print(f"{filename} -> {cache_file}: parsed in {parse_time:.2f}ms, loads in {load_time:.2f}ms")
+        cache_files.append(cache_file)
+    return cache_files
+
+
+# A graph container holds many map files, one after the other, then an
+# index of the offset and length of each of them as pairs of little-endian
+# uint64s, then a trailer of the index offset, the number of graphs and the
+# magic. Graph ids count from 1, like test_{i}.txt files.
+GRAPH_CONTAINER_MAGIC = b'PFMAPS\x00\x01'
+GRAPH_CONTAINER_TRAILER = struct.Struct('<QQ8s')
+GRAPH_CONTAINER_ENTRY = struct.Struct('<QQ')
+
+
+class GraphContainerWriter:
+    """Write map files one after the other into a graph container:
+        with GraphContainerWriter('maps.graphs') as container:
+            graph_id = container.add(text)
+    add takes the bytes or str of a map file, or a function that writes
+    one to the (buffered, binary) file it is given, so large graphs can be
+    written a piece at a time. The index is written when the container is
+    closed."""
+
+    def __init__(self, filename, buffering=2 ** 20):
+        self.file = open(filename, 'wb', buffering=buffering)
+        self.entries = []
+
+    def add(self, graph):
+        """Append a map file and return its graph id."""
+        start = self.file.tell()
+        if callable(graph):
+            graph(self.file)
+        else:
+            self.file.write(graph.encode() if isinstance(graph, str) else graph)
+        self.entries.append((start, self.file.tell() - start))
+        return len(self.entries)
+
+    def close(self):
+        if self.file.closed:
+            return
+        index_offset = self.file.tell()
+        self.file.writelines(GRAPH_CONTAINER_ENTRY.pack(*entry) for entry in self.entries)
+        self.file.write(GRAPH_CONTAINER_TRAILER.pack(index_offset, len(self.entries), GRAPH_CONTAINER_MAGIC))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class GraphContainer:
+    """Read graphs by id from a graph container written with
+    GraphContainerWriter. container[graph_id] reads one index entry and
+    that graph's bytes, whatever the number of graphs, and parses them
+    into (graph, origin, destinations); container.data(graph_id) returns
+    the bytes."""
+
+    def __init__(self, filename):
+        self.file = open(filename, 'rb')
+        trailer = b''
+        if self.file.seek(0, os.SEEK_END) >= GRAPH_CONTAINER_TRAILER.size:
+            self.file.seek(-GRAPH_CONTAINER_TRAILER.size, os.SEEK_END)
+            trailer = self.file.read(GRAPH_CONTAINER_TRAILER.size)
+        self.index_offset, self.count, magic = GRAPH_CONTAINER_TRAILER.unpack(
+            trailer or bytes(GRAPH_CONTAINER_TRAILER.size))
+        if magic != GRAPH_CONTAINER_MAGIC:
+            self.file.close()
+            raise ValueError(f"{filename} is not a graph container")
+
+    def __len__(self):
+        return self.count
+
+    def data(self, graph_id):
+        if not 1 <= graph_id <= self.count:
+            raise KeyError(graph_id)
+        self.file.seek(self.index_offset + (graph_id - 1) * GRAPH_CONTAINER_ENTRY.size)
+        start, length = GRAPH_CONTAINER_ENTRY.unpack(self.file.read(GRAPH_CONTAINER_ENTRY.size))
+        self.file.seek(start)
+        return self.file.read(length)
+
+    def __getitem__(self, graph_id):
+        return parse_graph_data(self.data(graph_id))
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def parse_graph_file(filename):
+    """Read a map file with Nodes:, Edges:, Origin: and Destinations:
+    sections and return (graph, origin, destinations), as parsed by
+    parse_graph_data."""
+    with open(filename, 'rb') as file:
+        return parse_graph_data(file.read())
+
+
+def parse_graph_data(data):
+    """Parse the bytes of a map file and return (graph, origin,
+    destinations). The Nodes: and Edges: sections are each parsed in one go
+    into NumPy arrays of `id x y` and `from to cost` records, which are
+    grouped into the graph's links with sorts instead of a scan of every
+    edge for every node. Costs are rounded to ints, only the first of
+    duplicate edges is kept, edges out of unlisted nodes are dropped, and
+    links keep the order of their nodes and of the file. Files whose
+    records do not all have that shape are read line by line instead."""
+
+    # Divide the file into sections and name each section by its component
+    sections = {}
+    headers = list(MAP_SECTIONS.finditer(data))
+    for header, following in zip(headers, headers[1:] + [None]):
+        body = data[header.end():following.start() if following else len(data)]
+        sections.setdefault(header.group(1).decode(), []).append(body)
+    sections = {name: b'\n'.join(bodies) for name, bodies in sections.items()}
+
+    nodes = parse_map_records(sections.get('Nodes', b''), ids=1)
+    edges = parse_map_records(sections.get('Edges', b''), ids=2)
+    if nodes is None or edges is None:
+        return load_graph_from_lines(data.decode().splitlines())
+
+    # e.g. {1: [2.0, 3.0]}; a repeated node keeps its place and its last location
+    ids = nodes[:, 0].astype(np.int64)
+    locations = dict(zip(ids.tolist(), nodes[:, 1:].tolist()))
+    graph_map = Graph(link_map_edges(ids, edges))
+    graph_map.locations = locations
+
+    origin = None
+    for line in sections.get('Origin', b'').decode().splitlines():
+        if line.strip():
+            origin = int(line)
+    destinations = []
+    for line in sections.get('Destinations', b'').decode().splitlines():
+        if line.strip():
+            destinations = list(map(int, line.split(';')))
+
+    return graph_map, origin, destinations
+
+
+def parse_map_records(text, ids):
+    """Parse the `1: (4,10)` or `(1,4): 14` lines of a Nodes: or Edges:
+    section into an array with a row of three numbers per line, the first
+    ids of them node ids, or return None if the lines are not all like
+    that."""
+    count = text.count(b':')
+    if text.count(b',') != count:
+        return None
+    try:
+        values = np.fromstring(text.translate(MAP_PUNCTUATION).decode('ascii'), sep=' ')
+    except (ValueError, UnicodeDecodeError):
+        return None
+    if values.size != 3 * count:
+        return None
+    values = values.reshape(count, 3)
+    if not np.array_equal(values[:, :ids], np.trunc(values[:, :ids])):
+        return None
+    return values
+
+
+def link_map_edges(ids, edges):
+    """Return the graph_dict of the `from to cost` rows of edges: the
+    first link between each pair of nodes, for nodes in ids, with nodes in
+    the order they first appear in ids and their links in file order."""
+    sources = edges[:, 0].astype(np.int64)
+    targets = edges[:, 1].astype(np.int64)
+    costs = np.rint(edges[:, 2]).astype(np.int64)  # Halves to even, like round()
+
+    # Rank every node by its first appearance, and drop edges out of unlisted nodes
+    unique_ids, first = np.unique(ids, return_index=True)
+    ranks = np.empty(len(unique_ids), dtype=np.int64)
+    ranks[np.argsort(first)] = np.arange(len(unique_ids))
+    found = np.minimum(np.searchsorted(unique_ids, sources), max(len(unique_ids) - 1, 0))
+    listed = unique_ids[found] == sources if len(unique_ids) else np.zeros(len(sources), dtype=bool)
+    order = np.flatnonzero(listed)
+    source_ranks = ranks[found[order]]
+
+    # Keep the first edge of each (from, to) pair, then put them in node and file order
+    by_pair = np.lexsort((order, targets[order], source_ranks))
+    first_of_pair = np.ones(len(by_pair), dtype=bool)
+    first_of_pair[1:] = ((source_ranks[by_pair][1:] != source_ranks[by_pair][:-1])
+                         | (targets[order][by_pair][1:] != targets[order][by_pair][:-1]))
+    kept = by_pair[first_of_pair]
+    kept = kept[np.lexsort((order[kept], source_ranks[kept]))]
+    order, source_ranks = order[kept], source_ranks[kept]
+
+    starts = np.flatnonzero(np.diff(source_ranks)) + 1
+    bounds = zip([0] + starts.tolist(), starts.tolist() + [len(order)])
+    sources, targets, costs = sources[order].tolist(), targets[order].tolist(), costs[order].tolist()
+    return {sources[start]: dict(zip(targets[start:end], costs[start:end])) for start, end in bounds if end > start}
+
+
+def load_graph_from_lines(lines):
+    """parse_graph_file for the lines of a map file, parsed one at a
+    time, for files the bulk parser does not take."""
+
+    # Set up data structures
+    nodes = {}
+    edges = {}
+    origin = None
+    destinations = []
+    graph_map = Graph()
+
+    # Divide the lines from the text file into sections and name each section by its component
+    section = None
+    for line in lines:
+        line = line.strip()
+        if line == "Nodes:":
+            section = "nodes"
+            continue
+        elif line == "Edges:":
+            section = "edges"
+            continue
+        elif line == "Origin:":
+            section = "origin"
+            continue
+        elif line == "Destinations:":
+            section = "destinations"
+            continue
+
+        if not line:
+            continue
+
+        # Assign each section's lines with each element in the corresponding data structure
+        if section == "nodes":
+            # e.g. {1:(2,3)}
+            parts = line.split(":")
+            node = int(parts[0])
+            coords = list(map(float, parts[1].strip(" ()").split(',')))
+            nodes[node] = coords
+        elif section == "edges":
+            # e.g. {(1,2):3}
+            parts = line.split(":")
+            n1, n2 = map(int, parts[0].strip(" ()").split(','))
+            cost = round(float(parts[1]))
+            edges.setdefault((n1, n2), cost)
+        elif section == "origin":
+            origin = int(line)
+        elif section == "destinations":
+            destinations = list(map(int, line.split(';')))
+
+    # Create the graph from these sections, one node's links at a time
+    links = {}
+    for (n1, n2), cost in edges.items():
+        links.setdefault(n1, []).append((n2, cost))
+    for node in nodes:
+        for n2, cost in links.get(node, ()):
+            graph_map.connect1(node, n2, cost) # One way connection
+    graph_map.locations = nodes
+
+    return graph_map, origin, destinations
+
+
+class GraphProblem(Problem):
+    """The problem of searching a graph from one node to another.
+    goal can be one node or a list or set of nodes, which is kept as a
+    frozenset; any other goal, a tuple included, is one node. The
+    straight-line heuristic to the nearest goal is computed for every
+    located node in one NumPy operation the first time h is called, so
+    searches that never call it do not pay for it, and h looks it up by
+    state. With lazy_h, it is only computed (and kept) for the
+    states h is asked about, for graphs too large to do them all."""
+
+    def __init__(self, initial, goal, graph, lazy_h=False):
+        if isinstance(goal, (list, set, frozenset)):
+            goal = frozenset(goal)
+        super().__init__(initial, goal)
+        self.graph = graph
+        self.lazy_h = lazy_h
+        self.h_table = None
+        self.goal_points = None
+
+    def actions(self, A):
+        """The actions at a graph node are just its neighbors."""
+        return list(self.graph.get(A).keys())
+
+    def result(self, state, action):
+        """The result of going to a neighbor is just that neighbor."""
+        return action
+
+    def path_cost(self, cost_so_far, A, action, B):
+        return cost_so_far + (self.graph.get(A, B) or np.inf)
+
+    def find_min_edge(self):
+        """Find minimum value of edges."""
+        m = np.inf
+        for d in self.graph.graph_dict.values():
+            local_min = min(d.values())
+            m = min(m, local_min)
+
+        return m
+
+    def build_h_table(self):
+        """Set goal_points to the (x, y) of every goal, and fill h_table for
+        every located node unless lazy_h. goal_points stays None if there
+        is no goal, or if some goal has no location, as a straight line to
+        the other goals could then overestimate: h is 0 everywhere."""
+        self.h_table = {}
+        locs = getattr(self.graph, 'locations', None)
+        if not locs:
+            return
+        goals = self.goal if isinstance(self.goal, frozenset) else [self.goal]
+        if not goals or any(g not in locs for g in goals):
+            return
+        self.goal_points = np.array([locs[g] for g in goals], dtype=float)
+        if self.lazy_h:
+            return
+        if isinstance(self.graph, CSRGraph):
+            located = np.flatnonzero(~np.isnan(self.graph.coords[:, 0]))
+            states = self.graph.label_array[located].tolist()
+            points = self.graph.coords[located]
+        else:
+            states = list(locs)
+            points = list(locs.values())
+        self.h_table = self.goal_distances(states, points)
+
+    def goal_distances(self, states, points, chunk=2 ** 22):
+        """Return {state: straight-line distance from its point to the
+        nearest goal, truncated to an int} for the given states and (x, y)
+        points, working through chunk distances at a time."""
+        goal_points = self.goal_points
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        nearest = np.empty(len(points), dtype=np.int64)
+        step = max(1, chunk // len(goal_points))
+        for i in range(0, len(points), step):
+            block = points[i:i + step]
+            dists = np.hypot(block[:, None, 0] - goal_points[None, :, 0],
+                             block[:, None, 1] - goal_points[None, :, 1])
+            nearest[i:i + step] = dists.min(axis=1)
+        return dict(zip(states, nearest.tolist()))
+
+    def h(self, node):
+        """h function is straight-line distance from a node's state to goal:
+        inf if the graph has no locations, 0 for states without one or if
+        the goals cannot all be located."""
+        state = node.state if isinstance(node, Node) else node
+        if self.h_table is None:
+            self.build_h_table()
+        try:
+            return self.h_table[state]
+        except KeyError:
+            locs = getattr(self.graph, 'locations', None)
+            if not locs:
+                return np.inf
+            goal_points = self.goal_points
+            if goal_points is None or state not in locs:
+                return 0
+            x, y = locs[state]
+            value = self.h_table[state] = int(np.hypot(x - goal_points[:, 0], y - goal_points[:, 1]).min())
+            return value
@@ -0,0 +1,265 @@
+"""
+Contraction hierarchies, for many queries on one fixed map.
+"""
+
+import heapq
+import os
+import time
+
+from .search import Node
+from .utils import np
+
+
+# ______________________________________________________________________________
+# Contraction Hierarchies
+
+
+class ContractionHierarchy:
+    """A contraction hierarchy over a Graph (or CSRGraph), for answering
+    many queries on one fixed map. Preprocessing contracts the nodes one
+    at a time, cheapest first, and adds a shortcut link around every
+    contracted node wherever it was on the only shortest path between two
+    of its neighbours. A query then only searches upwards (towards nodes
+    contracted later) from both ends.
+    rank[node] is the order in which node was contracted. up[a] holds the
+    links a -> b and down[a] the links b -> a for nodes b ranked above a,
+    as {b: cost}, including shortcuts. middle[(a, b)] is the node the
+    shortcut a -> b was added around, so len(middle) is the number of
+    shortcuts.
+        hierarchy = ContractionHierarchy(graph)
+        hierarchy.save('test_1.ch.npz')
+        path = hierarchy.query(origin, destinations)  # like Node.path()"""
+
+    def __init__(self, graph=None, witness_limit=1000):
+        self.rank = {}
+        self.up = {}
+        self.down = {}
+        self.middle = {}
+        self.nodes_expanded = 0
+        if graph is not None:
+            self.build(graph, witness_limit)
+
+    def build(self, graph, witness_limit=1000):
+        """Contract every node of graph in order of edge difference (the
+        shortcuts contracting it adds minus the links it removes, plus the
+        number of its neighbours already contracted), which is kept up to
+        date lazily. Witness searches settle at most witness_limit nodes.
+        Located nodes without links are ranked too."""
+        out = {a: {} for a in graph.nodes()}
+        out.update((a, {}) for a in (getattr(graph, 'locations', None) or ()) if a not in out)
+        into = {a: {} for a in out}
+        for a in out:
+            for b, cost in graph.get(a).items():
+                if a != b:
+                    out[a][b] = cost
+                    into[b][a] = cost
+        contracted_neighbours = dict.fromkeys(out, 0)
+
+        def shortcuts_for(u):
+            """Return the (a, b, cost) shortcuts needed to contract u."""
+            needed = []
+            for a, cost_in in into[u].items():
+                limit = max((cost_in + cost_out for b, cost_out in out[u].items() if b != a), default=None)
+                if limit is None:
+                    continue
+                witness = self.witness_costs(out, a, u, out[u].keys(), limit, witness_limit)
+                for b, cost_out in out[u].items():
+                    if b != a and witness.get(b, np.inf) > cost_in + cost_out:
+                        needed.append((a, b, cost_in + cost_out))
+            return needed
+
+        def priority(u):
+            needed = shortcuts_for(u)
+            return len(needed) - len(into[u]) - len(out[u]) + contracted_neighbours[u], needed
+
+        queue = [(priority(u)[0], u) for u in out]
+        heapq.heapify(queue)
+        while queue:
+            _, u = heapq.heappop(queue)
+            # Lazy update: contract u only if it is still the cheapest
+            current, needed = priority(u)
+            if queue and current > queue[0][0]:
+                heapq.heappush(queue, (current, u))
+                continue
+
+            for a, b, cost in needed:
+                if cost < out[a].get(b, np.inf):
+                    out[a][b] = into[b][a] = cost
+                    self.middle[(a, b)] = u
+            self.rank[u] = len(self.rank)
+            self.up[u] = out.pop(u)
+            self.down[u] = into.pop(u)
+            for b in self.up[u]:
+                del into[b][u]
+                contracted_neighbours[b] += 1
+            for a in self.down[u]:
+                del out[a][u]
+                contracted_neighbours[a] += 1
+
+    @staticmethod
+    def witness_costs(out, source, avoid, targets, limit, max_settled):
+        """Return the costs of the cheapest paths from source that do not
+        go through avoid, settling at most max_settled nodes and none
+        farther than limit, and stopping once all targets are settled."""
+        costs, best = {}, {source: 0}
+        remaining = len(targets)
+        frontier = [(0, source)]
+        while frontier and remaining and len(costs) < max_settled:
+            cost, a = heapq.heappop(frontier)
+            if a in costs:
+                continue
+            costs[a] = cost
+            if a in targets:
+                remaining -= 1
+            for b, dist in out[a].items():
+                if b != avoid and cost + dist <= limit and cost + dist < best.get(b, limit + 1):
+                    best[b] = cost + dist
+                    heapq.heappush(frontier, (cost + dist, b))
+        return costs
+
+    def query(self, origin, destinations, stats=None, budget=None):
+        """Return the cheapest path from origin to the nearest of
+        destinations (one node, or a list or set) as a list of Nodes from the
+        root, like Node.path(), or None if there is none.
+        Dijkstra runs upwards from both ends over up and down, one step at
+        a time on the side with the lower key, until neither side can
+        improve on the best meeting node. The number of nodes settled is
+        kept in nodes_expanded. Counts are added to stats, a SearchStats,
+        and the query stops at the limits of budget, a SearchBudget, if
+        given (the sizes are of both sides together)."""
+        if not isinstance(destinations, (list, set, frozenset)):
+            destinations = [destinations]
+        sides = [(self.up, {}, {origin: None}, [(0, origin)]),
+                 (self.down, {}, dict.fromkeys(destinations), [(0, goal) for goal in destinations])]
+        best_g = [{origin: 0}, dict.fromkeys(destinations, 0)]
+        heapq.heapify(sides[1][3])
+        mu, meeting = np.inf, None
+        start_time = time.perf_counter()
+        nodes_expanded = 0
+        check_at = np.inf if budget is None else budget.next_check(0)
+        while True:
+            tops = [frontier[0][0] if frontier else np.inf for _, _, _, frontier in sides]
+            side = 0 if tops[0] <= tops[1] else 1
+            if tops[side] >= mu:
+                break
+            links, settled, parents, frontier = sides[side]
+            if stats is not None:
+                stats.observe(len(sides[0][3]) + len(sides[1][3]), len(sides[0][1]) + len(sides[1][1]))
+            cost, a = heapq.heappop(frontier)
+            if a in settled:
+                continue
+            settled[a] = cost
+            nodes_expanded += 1
+            if nodes_expanded >= check_at:
+                check_at = budget.check(nodes_expanded, len(sides[0][3]) + len(sides[1][3]),
+                                        len(sides[0][1]) + len(sides[1][1]), start_time, stats)
+            other = sides[1 - side][1]
+            if a in other and cost + other[a] < mu:
+                mu, meeting = cost + other[a], a
+            children = links.get(a, {})
+            if stats is not None:
+                stats.expanded += 1
+                stats.generated += len(children)
+                stats.pruned += len(children)  # Less the ones pushed below
+            for b, dist in children.items():
+                if cost + dist < best_g[side].get(b, np.inf):
+                    if stats is not None:
+                        stats.pruned -= 1
+                        if b in best_g[side]:
+                            stats.decrease_keys += 1
+                    best_g[side][b] = cost + dist
+                    parents[b] = a
+                    heapq.heappush(frontier, (cost + dist, b))
+        self.nodes_expanded = nodes_expanded
+        if meeting is None:
+            return None
+
+        forward_parents, backward_parents = sides[0][2], sides[1][2]
+        states = [meeting]
+        while forward_parents[states[-1]] is not None:
+            states.append(forward_parents[states[-1]])
+        states.reverse()
+        while backward_parents[states[-1]] is not None:
+            states.append(backward_parents[states[-1]])
+
+        node = Node(origin)
+        for a, b in zip(states, states[1:]):
+            for c, d in self.unpack(a, b):
+                node = Node(d, node, d, node.path_cost + self.cost(c, d))
+        return node.path()
+
+    def cost(self, a, b):
+        """Return the cost of the link a -> b in the hierarchy."""
+        if self.rank[a] < self.rank[b]:
+            return self.up[a][b]
+        return self.down[b][a]
+
+    def unpack(self, a, b):
+        """Return the original links a shortcut a -> b stands for."""
+        links, stack = [], [(a, b)]
+        while stack:
+            a, b = stack.pop()
+            if (a, b) in self.middle:
+                m = self.middle[(a, b)]
+                stack.append((m, b))
+                stack.append((a, m))
+            else:
+                links.append((a, b))
+        return links
+
+    def save(self, filename):
+        """Save the hierarchy (ranks, upward and downward links with their
+        shortcut middles) to a .npz file."""
+        nodes = sorted(self.rank, key=self.rank.get)
+        index = {node: i for i, node in enumerate(nodes)}
+        arrays = {'nodes': np.array(nodes)}
+        for name, links in (('up', self.up), ('down', self.down)):
+            rows = [links[node] for node in nodes]
+            arrays[name + '_offsets'] = np.cumsum([0] + [len(row) for row in rows])
+            arrays[name + '_targets'] = np.array([index[b] for row in rows for b in row], dtype=np.int64)
+            arrays[name + '_costs'] = np.array([cost for row in rows for cost in row.values()])
+        arrays['middle'] = np.array([(index[a], index[b], index[m]) for (a, b), m in self.middle.items()],
+                                    dtype=np.int64).reshape(-1, 3)
+        np.savez(filename, **arrays)
+
+    @classmethod
+    def load(cls, filename):
+        """Load a hierarchy saved with save()."""
+        hierarchy = cls()
+        with np.load(filename) as data:
+            nodes = data['nodes'].tolist()
+            hierarchy.rank = {node: i for i, node in enumerate(nodes)}
+            for name in ('up', 'down'):
+                offsets = data[name + '_offsets'].tolist()
+                targets = data[name + '_targets'].tolist()
+                costs = data[name + '_costs'].tolist()
+                getattr(hierarchy, name).update(
+                    (node, {nodes[t]: c for t, c in zip(targets[offsets[i]:offsets[i + 1]],
+                                                         costs[offsets[i]:offsets[i + 1]])})
+                    for i, node in enumerate(nodes))
+            hierarchy.middle = {(nodes[a], nodes[b]): nodes[m] for a, b, m in data['middle'].tolist()}
+        return hierarchy
+
+    @classmethod
+    def for_file(cls, filename, graph):
+        """Load the hierarchy saved next to a graph file, or build and save
+        it there if there is none or the graph file is newer."""
+        hierarchy_file = os.path.splitext(filename)[0] + '.ch.npz'
+        if os.path.exists(hierarchy_file) and os.path.getmtime(hierarchy_file) >= os.path.getmtime(filename):
+            return cls.load(hierarchy_file)
+        hierarchy = cls(graph)
+        hierarchy.save(hierarchy_file)
+        return hierarchy
+
+
+def contraction_hierarchy_search(problem, hierarchy=None, stats=None, budget=None):
+    """Answer problem with a ContractionHierarchy query, which is built for
+    problem.graph (and kept on it) if none is given. The preprocessing is
+    not counted in the runtime, nor in stats or budget."""
+    if hierarchy is None:
+        hierarchy = getattr(problem.graph, 'hierarchy', None)
+        if hierarchy is None:
+            hierarchy = problem.graph.hierarchy = ContractionHierarchy(problem.graph)
+    start_time = time.perf_counter()
+    path = hierarchy.query(problem.initial, problem.goal, stats, budget)
+    return path and path[-1], hierarchy.nodes_expanded, (time.perf_counter() - start_time) * 1000
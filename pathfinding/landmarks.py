@@ -0,0 +1,140 @@
+"""
+The ALT heuristic: A* with landmark lower bounds.
+"""
+
+import os
+
+from .graph import shortest_path_costs
+from .search import astar_search
+from .utils import np
+
+
+# ______________________________________________________________________________
+# A* heuristics 
+
+
+class Landmarks:
+    """Landmark distances for the ALT heuristic (A*, landmarks and the
+    triangle inequality). For a landmark L and any nodes v and t,
+        d(v, t) >= d(L, t) - d(L, v)  and  d(v, t) >= d(v, L) - d(t, L),
+    so the largest of these over all landmarks is an admissible estimate
+    of the cost from v to t, and a much tighter one than straight-line
+    distance when links cost more than the distance they cover.
+    forward[k] holds d(landmarks[k], v) and backward[k] holds
+    d(v, landmarks[k]) for every node v in nodes, as int32 (or float64 for
+    fractional lengths) with UNREACHABLE for no path; nodes are those with
+    links and those with a location, which may have none. Landmarks are
+    picked one at a time as the node farthest from those already picked.
+        landmarks = Landmarks(graph, k=8)
+        landmarks.save('test_1.landmarks.npz')
+        astar_search(problem, landmarks.heuristic(problem.goal))"""
+
+    UNREACHABLE = 2 ** 31 - 1  # np.iinfo(np.int32).max, without importing NumPy
+
+    def __init__(self, graph=None, k=8, nodes=None, landmarks=None, forward=None, backward=None):
+        if graph is not None:
+            nodes, landmarks, forward, backward = self.preprocess(graph, k)
+        self.nodes = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self.landmarks = list(landmarks)
+        self.forward = forward
+        self.backward = backward
+
+    def preprocess(self, graph, k):
+        """Pick up to k landmarks and return nodes, landmarks and the
+        forward and backward distance arrays."""
+        nodes = graph.nodes()
+        linked = set(nodes)
+        nodes += [node for node in (getattr(graph, 'locations', None) or ()) if node not in linked]
+        if not nodes:
+            return nodes, [], np.zeros((0, 0), dtype=np.int32), np.zeros((0, 0), dtype=np.int32)
+        reverse = graph.reverse()
+        index = {node: i for i, node in enumerate(nodes)}
+
+        def distances(g, source):
+            costs = np.full(len(nodes), np.inf)
+            for node, cost in shortest_path_costs(g, [source]).items():
+                costs[index[node]] = cost
+            return costs
+
+        forward, backward, landmarks = [], [], []
+        # Start from the node farthest from an arbitrary one
+        nearest = distances(graph, nodes[0])
+        for _ in range(min(k, len(nodes))):
+            reached = np.where(np.isfinite(nearest), nearest, -1)
+            if landmarks:
+                reached[[index[landmark] for landmark in landmarks]] = -1
+            landmark = nodes[int(np.argmax(reached))]
+            landmarks.append(landmark)
+            forward.append(distances(graph, landmark))
+            backward.append(distances(reverse, landmark))
+            nearest = forward[-1] if len(landmarks) == 1 else np.minimum(nearest, forward[-1])
+
+        return nodes, landmarks, self.compact(np.array(forward)), self.compact(np.array(backward))
+
+    def compact(self, costs):
+        """Store distances as int32 when they are all whole numbers that fit."""
+        finite = costs[np.isfinite(costs)]
+        if np.all(finite == np.round(finite)) and (finite.size == 0 or finite.max() < self.UNREACHABLE):
+            return np.where(np.isfinite(costs), costs, self.UNREACHABLE).astype(np.int32)
+        return costs
+
+    def expand(self, costs):
+        """Turn stored distances back into float64 with inf for no path."""
+        if costs.dtype == np.int32:
+            return np.where(costs == self.UNREACHABLE, np.inf, costs.astype(np.float64))
+        return costs
+
+    def save(self, filename):
+        """Save the landmark distances to a .npz file."""
+        np.savez(filename, nodes=np.array(self.nodes), landmarks=np.array(self.landmarks),
+                 forward=self.forward, backward=self.backward)
+
+    @classmethod
+    def load(cls, filename):
+        """Load landmark distances saved with save()."""
+        with np.load(filename) as data:
+            return cls(nodes=data['nodes'].tolist(), landmarks=data['landmarks'].tolist(),
+                       forward=data['forward'], backward=data['backward'])
+
+    @classmethod
+    def for_file(cls, filename, graph, k=8):
+        """Load the landmarks saved next to a graph file, or preprocess and
+        save them there if there are none or the graph file is newer."""
+        landmark_file = os.path.splitext(filename)[0] + '.landmarks.npz'
+        if os.path.exists(landmark_file) and os.path.getmtime(landmark_file) >= os.path.getmtime(filename):
+            return cls.load(landmark_file)
+        landmarks = cls(graph, k)
+        landmarks.save(landmark_file)
+        return landmarks
+
+    def heuristic(self, goal):
+        """Return h(node) for goal (a node, or a list or set of nodes): the
+        largest landmark lower bound on the cost to the nearest goal. It is
+        worked out for every node at once. States the landmarks do not
+        know get 0, as does every state if some goal is unknown."""
+        goals = goal if isinstance(goal, (list, set, frozenset)) else [goal]
+        if any(goal not in self.index for goal in goals):
+            return lambda node: 0
+        forward, backward = self.expand(self.forward), self.expand(self.backward)
+        bound = np.full(len(self.nodes), np.inf)
+        with np.errstate(invalid='ignore'):
+            for t in [self.index[goal] for goal in goals]:
+                to_t = np.maximum(forward[:, t, None] - forward, backward - backward[:, t, None])
+                # inf - inf means neither side is reachable, which says nothing
+                to_t = np.nan_to_num(to_t, nan=0, posinf=np.inf, neginf=0)
+                bound = np.minimum(bound, np.maximum(to_t.max(axis=0), 0))
+        bounds = dict(zip(self.nodes, bound.tolist()))
+        return lambda node: bounds.get(node.state, 0)
+
+
+def alt_search(problem, landmarks=None, display=False, stats=None, budget=None):
+    """A* search with the ALT heuristic of landmarks, which are preprocessed
+    for problem.graph (and kept on it) if none are given. Counts are added
+    to stats, a SearchStats, and the search stops at the limits of budget,
+    a SearchBudget, if given."""
+    if landmarks is None:
+        landmarks = getattr(problem.graph, 'landmarks', None)
+        if landmarks is None:
+            landmarks = problem.graph.landmarks = Landmarks(problem.graph)
+    return astar_search(problem, landmarks.heuristic(problem.goal), display, stats, budget)
@@ -0,0 +1,338 @@
+"""
+Running the search methods by name: one problem, a batch of queries on one
+graph, or (file, method) jobs, optionally on a process pool.
+"""
+
+import contextlib
+import heapq
+import io
+import math
+import os
+import sys
+import time
+
+from .bidirectional import bidirectional_astar_search, bidirectional_uniform_cost_search
+from .graph import GraphProblem, load_graph_from_file
+from .hierarchy import ContractionHierarchy, contraction_hierarchy_search
+from .landmarks import Landmarks, alt_search
+from .search import (BudgetExceeded, Node, SearchStats, anytime_astar_search, astar_search, best_first_graph_search,
+                     breadth_first_graph_search, depth_first_graph_search, iterative_deepening_astar_search,
+                     uniform_cost_search)
+
+
+def run_algorithm(method, problem, stats=None, budget=None):
+    """Run the search named method on problem and return (result node,
+    nodes explored, runtime in ms), adding its counts to stats, a
+    SearchStats, if given, and within budget, a SearchBudget, if given (a
+    search that goes over it raises BudgetExceeded)."""
+
+    if method == "DFS":
+        result_node, explored, runtime_ms = depth_first_graph_search(problem, stats=stats, budget=budget)
+    elif method == "BFS":
+        result_node, explored, runtime_ms = breadth_first_graph_search(problem, stats=stats, budget=budget)
+    elif method == "GBFS":
+        result_node, explored, runtime_ms = best_first_graph_search(problem, lambda n: problem.h(n), display=True,
+                                                                    stats=stats, budget=budget)
+    elif method == "AS":
+        result_node, explored, runtime_ms = astar_search(problem, lambda n: problem.h(n), display=True, stats=stats,
+                                                         budget=budget)
+    elif method == "CUS1":
+        result_node, explored, runtime_ms = uniform_cost_search(problem, stats, budget)
+    elif method == "CUS2":
+        result_node, explored, runtime_ms = iterative_deepening_astar_search(problem, lambda n: problem.h(n),
+                                                                             stats=stats, budget=budget)
+    elif method == "ARA":
+        result_node, explored, runtime_ms = anytime_solution(problem, stats, budget)
+    elif method == "ALT":
+        result_node, explored, runtime_ms = alt_search(problem, display=True, stats=stats, budget=budget)
+    elif method == "BUCS":
+        result_node, explored, runtime_ms = bidirectional_uniform_cost_search(problem, stats, budget)
+    elif method == "BAS":
+        result_node, explored, runtime_ms = bidirectional_astar_search(problem, stats=stats, budget=budget)
+    elif method == "CH":
+        result_node, explored, runtime_ms = contraction_hierarchy_search(problem, stats=stats, budget=budget)
+    else:
+        raise ValueError(f"Unsupported method: {method}")
+
+    return result_node, explored, runtime_ms
+
+
+def anytime_solution(problem, stats=None, budget=None):
+    """Run anytime_astar_search on problem and return its last solution,
+    as (result node, nodes explored, runtime in ms): the optimal one or,
+    if budget stops the search first, the best found before it did, with
+    the nodes explored and runtime up to the stop (a search stopped
+    before finding any raises BudgetExceeded)."""
+    result = None
+    try:
+        for *result, bound in anytime_astar_search(problem, lambda n: problem.h(n), display=True, stats=stats,
+                                                   budget=budget):
+            pass
+    except BudgetExceeded as exceeded:
+        if result is None:
+            raise
+        print(f"{exceeded}, keeping the best solution so far")
+        return result[0], exceeded.expanded, exceeded.runtime
+    return tuple(result)
+
+
+# ______________________________________________________________________________
+# Profiling
+
+
+PROFILE_MODES = ("cpu", "memory")
+
+
+def profile_algorithm(method, problem, prefix, modes=PROFILE_MODES, stats=None, budget=None, top=10):
+    """Run run_algorithm(method, problem, stats, budget) once for each of
+    modes, print a short summary of each run and return the result of the
+    first (or raise its BudgetExceeded, once every run is profiled):
+    "cpu" runs it under cProfile and dumps the profile to {prefix}.prof
+    (for pstats or snakeviz); "memory" runs it under tracemalloc and
+    writes the peak memory the search allocated and its top allocation
+    sites near that peak to {prefix}.memory. The runtimes include
+    the profilers' overhead, and only the first run counts in stats.
+    run_algorithm itself is left alone, so searches that are not
+    profiled pay nothing for this."""
+    results = []
+    for mode in modes:
+        run = lambda: run_algorithm(method, problem, None if results else stats, budget)
+        if mode == "cpu":
+            result, summary = cpu_profile(run, prefix + '.prof')
+        elif mode == "memory":
+            result, summary = memory_profile(run, prefix + '.memory', top)
+        else:
+            raise ValueError(f"Unsupported profiling mode: {mode}")
+        print(summary)
+        results.append(result)
+    if isinstance(results[0], BudgetExceeded):
+        raise results[0]
+    return results[0]
+
+
+def cpu_profile(run, filename):
+    """Return run() (or the BudgetExceeded it raised) and a summary of the
+    three functions it spent the most time in, and dump its cProfile
+    profile to filename."""
+    import cProfile
+    profiler = cProfile.Profile()
+    try:
+        result = profiler.runcall(run)
+    except BudgetExceeded as exceeded:
+        result = exceeded
+    profiler.dump_stats(filename)
+    profiler.create_stats()
+    functions = sorted(profiler.stats.items(), key=lambda item: item[1][2], reverse=True)
+    total = sum(tottime for _, (_, _, tottime, _, _) in functions)
+    hottest = ", ".join(f"{name} ({os.path.basename(file)}:{line}) {tottime / total:.0%}"
+                        for (file, line, name), (_, _, tottime, _, _) in functions[:3])
+    return result, f"{filename}: {total * 1000:.1f} ms, most in {hottest}"
+
+
+def memory_profile(run, filename, top=10):
+    """Return run() (or the BudgetExceeded it raised) and a summary of the
+    memory it allocated, and write
+    the peak and the top allocation sites to filename. tracemalloc only
+    keeps the current allocations, so a snapshot is taken whenever a
+    function returns with 10% more traced memory than the last one; the
+    sites are those of the last, the largest seen at a return (within
+    10%), without hooking every allocation."""
+    import tracemalloc
+    snapshot = [None, 0]
+
+    def at_return(frame, event, arg):
+        if event == 'return':
+            current = tracemalloc.get_traced_memory()[0]
+            if current > snapshot[1] * 1.1:
+                snapshot[:] = tracemalloc.take_snapshot(), current
+
+    tracemalloc.start()
+    sys.setprofile(at_return)
+    try:
+        result = run()
+    except BudgetExceeded as exceeded:
+        result = exceeded
+    finally:
+        sys.setprofile(None)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    sites = snapshot[0].filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)]).statistics('lineno')
+    with open(filename, 'w') as file:
+        file.write(f"peak {peak / 2 ** 10:.0f} KiB allocated by the search\n"
+                   f"top {top} allocation sites at {snapshot[1] / 2 ** 10:.0f} KiB:\n")
+        file.writelines(f"{site.size / 2 ** 10:>10.1f} KiB {site.count:>8} blocks  {site.traceback}\n"
+                        for site in sites[:top])
+    largest = ", ".join(f"{os.path.basename(site.traceback[0].filename)}:{site.traceback[0].lineno} "
+                        f"{site.size / 2 ** 10:.0f} KiB" for site in sites[:3])
+    return result, f"{filename}: peak {peak / 2 ** 10:.0f} KiB, most at {largest}"
+
+
+# ______________________________________________________________________________
+# Batch Queries
+
+
+def load_queries_from_file(filename):
+    """Read one query per line, written as the origin, a colon and the
+    destinations separated by semicolons (e.g. 4: 2; 5), and return a
+    list of (origin, [destinations]) pairs."""
+    queries = []
+    with open(filename, 'r') as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            origin, destinations = line.split(":")
+            queries.append((int(origin), list(map(int, destinations.split(';')))))
+    return queries
+
+
+def shortest_path_tree_search(graph, origin, queries):
+    """Answer every (index, destinations) query from origin with one
+    uniform cost search that keeps going until each has reached its
+    nearest destination. States are popped in the same order as
+    uniform_cost_search, so each answer (and its count of nodes expanded)
+    is the one it would give on its own. Yields (index, result node,
+    nodes expanded, runtime in ms) as each query is answered; the runtime
+    is the time spent on the tree so far."""
+    start_time = time.perf_counter()
+    node = Node(origin)
+    waiting = {}
+    for i, destinations in queries:
+        if node.state in destinations:
+            yield i, node, 0, (time.perf_counter() - start_time) * 1000
+        else:
+            for goal in destinations:
+                waiting.setdefault(goal, []).append(i)
+    pending = {i for queue in waiting.values() for i in queue}
+    problem = GraphProblem(origin, frozenset(waiting), graph, lazy_h=True)
+
+    frontier = [(node.path_cost, node)]
+    best_cost = {node.state: node.path_cost}
+    explored = set()
+    nodes_expanded = 0
+
+    while frontier and pending:
+        cost, node = heapq.heappop(frontier)
+        if node.state in explored:
+            continue  # Stale entry, the state was reached more cheaply
+
+        nodes_expanded += 1
+        for i in waiting.pop(node.state, ()):
+            if i in pending:
+                pending.remove(i)
+                yield i, node, nodes_expanded, (time.perf_counter() - start_time) * 1000
+
+        explored.add(node.state)
+        for child in node.expand(problem):
+            if child.state not in explored and child.path_cost < best_cost.get(child.state, math.inf):
+                best_cost[child.state] = child.path_cost
+                heapq.heappush(frontier, (child.path_cost, child))
+
+    for i in sorted(pending):
+        yield i, None, nodes_expanded, (time.perf_counter() - start_time) * 1000
+
+
+def solve_batch(graph, queries, method="CUS1"):
+    """Answer many (origin, destinations) queries on one loaded graph, or
+    the queries in a file (see load_queries_from_file), and yield
+    (index, result node, nodes expanded, runtime in ms) for each, index
+    being its position in queries. With CUS1, queries are grouped by
+    origin and each group is answered by one shortest_path_tree_search,
+    as its results stream in. Other methods run once per query, in order,
+    with the heuristic computed lazily rather than for the whole map."""
+    if isinstance(queries, str):
+        queries = load_queries_from_file(queries)
+    queries = [(origin, destinations if isinstance(destinations, (list, set, frozenset)) else [destinations])
+               for origin, destinations in queries]
+    if method == "CUS1":
+        by_origin = {}
+        for i, (origin, destinations) in enumerate(queries):
+            by_origin.setdefault(origin, []).append((i, destinations))
+        for origin, group in by_origin.items():
+            yield from shortest_path_tree_search(graph, origin, group)
+    else:
+        for i, (origin, destinations) in enumerate(queries):
+            yield (i,) + run_algorithm(method, GraphProblem(origin, destinations, graph, lazy_h=True))
+
+
+ALL_ALGORITHMS = ["DFS", "BFS", "GBFS", "AS", "CUS1", "CUS2"]
+
+
+def prepare_graph(graph_map, file, algo):
+    """Load (or build and save) what algo keeps next to the graph file."""
+    if algo == "ALT":
+        graph_map.landmarks = Landmarks.for_file(file, graph_map)
+    elif algo == "CH":
+        graph_map.hierarchy = ContractionHierarchy.for_file(file, graph_map)
+
+
+def describe_result(result_node, origin):
+    """Return the final node, path cost and path that runGraphSeacrh
+    prints and draws for a search result."""
+    if result_node is None:
+        return "No solution", None, None
+    if result_node.state == origin:
+        return origin, None, None
+    return result_node.solution()[-1], result_node.path_cost, [p.state for p in result_node.path()]
+
+
+def profile_prefix(file, algo):
+    """Return the prefix of the profiles of algo on file: {name}.{algo}."""
+    return f"{os.path.splitext(file)[0]}.{algo}"
+
+
+def solve_problem(algo, problem, file, stats=None, budget=None, profile=None):
+    """Run algo on problem, the one in file, and return (final node, nodes
+    explored, path cost, runtime in ms, path) as runGraphSeacrh prints
+    them. The search counts in stats and is limited by budget (a search
+    over it gives "Budget exceeded ({reason})", the nodes it expanded and
+    no path), and with profile, a collection of PROFILE_MODES, it is
+    profiled by profile_algorithm."""
+    try:
+        if profile:
+            result_node, explored, runtime = profile_algorithm(algo, problem, profile_prefix(file, algo), profile,
+                                                               stats, budget)
+        else:
+            result_node, explored, runtime = run_algorithm(algo, problem, stats, budget)
+    except BudgetExceeded as exceeded:
+        return f"Budget exceeded ({exceeded.reason})", exceeded.expanded, None, exceeded.runtime, None
+    final_node, path_cost, path = describe_result(result_node, problem.initial)
+    return final_node, explored, path_cost, runtime, path
+
+
+def solve_file(file, algo, stats=False, profile=None, budget=None):
+    """Load the problem in file and return solve_problem(algo, problem,
+    file, ...), and the search's SearchStats after it with stats. Only
+    plain values are returned, so a worker process can send them back
+    cheaply."""
+    graph_map, origin, dest = load_graph_from_file(file)
+    prepare_graph(graph_map, file, algo)
+    search_stats = SearchStats() if stats else None
+    result = solve_problem(algo, GraphProblem(origin, dest, graph_map), file, search_stats, budget, profile)
+    if stats:
+        return result + (search_stats,)
+    return result
+
+
+def solve_file_quietly(file, algo, stats=False, profile=None, budget=None):
+    """Return what solve_file(file, algo, ...) prints along with its result."""
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        result = solve_file(file, algo, stats, profile, budget)
+    return output.getvalue(), result
+
+
+def solve_files(jobs, workers=None, stats=False, profile=None, budget=None):
+    """Yield solve_file(file, algo, stats, profile, budget) for each (file,
+    algo) in jobs, in the order of jobs. With workers, the jobs are spread
+    over a ProcessPoolExecutor with that many processes, and what each job
+    prints is held back and printed in order as its result is yielded."""
+    if workers is None:
+        for file, algo in jobs:
+            yield solve_file(file, algo, stats, profile, budget)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(workers) as executor:
+        for output, result in executor.map(solve_file_quietly, [file for file, _ in jobs], [algo for _, algo in jobs],
+                                           [stats] * len(jobs), [profile] * len(jobs), [budget] * len(jobs)):
+            print(output, end="")
+            yield result
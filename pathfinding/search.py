@@ -0,0 +1,695 @@
+"""
+Search (Chapters 3-4)
+
+The way to use this code is to subclass Problem to create a class of problems,
+then create problem instances and solve them with calls to the various search
+functions.
+"""
+
+import heapq
+import math
+import time
+from collections import deque
+
+from .utils import IndexedPriorityQueue, memoize
+
+
+class Problem:
+    """The abstract class for a formal problem. You should subclass
+    this and implement the methods actions and result, and possibly
+    __init__, goal_test, and path_cost. Then you will create instances
+    of your subclass and solve them with the various search functions."""
+
+    def __init__(self, initial, goal=None):
+        """The constructor specifies the initial state, and possibly a goal
+        state, if there is a unique goal. Your subclass's constructor can add
+        other arguments."""
+        self.initial = initial
+        self.goal = goal
+
+    def actions(self, state):
+        """Return the actions that can be executed in the given
+        state. The result would typically be a list, but if there are
+        many actions, consider yielding them one at a time in an
+        iterator, rather than building them all at once."""
+        raise NotImplementedError
+
+    def result(self, state, action):
+        """Return the state that results from executing the given
+        action in the given state. The action must be one of
+        self.actions(state)."""
+        raise NotImplementedError
+
+    def goal_test(self, state):
+        """Return True if the state is a goal. The default method compares the
+        state to self.goal or checks for state in self.goal if it is a
+        list or set, as specified in the constructor. Override this method if
+        checking against a single self.goal is not enough."""
+        if isinstance(self.goal, (list, set, frozenset)):
+            return state in self.goal
+        else:
+            return state == self.goal
+
+    def path_cost(self, c, state1, action, state2):
+        """Return the cost of a solution path that arrives at state2 from
+        state1 via action, assuming cost c to get up to state1. If the problem
+        is such that the path doesn't matter, this function will only look at
+        state2. If the path does matter, it will consider c and maybe state1
+        and action. The default method costs 1 for every step in the path."""
+        return c + 1
+
+    def value(self, state):
+        """For optimization problems, each state has a value. Hill Climbing
+        and related algorithms try to maximize this value."""
+        raise NotImplementedError
+
+
+# ______________________________________________________________________________
+
+
+class Node:
+    """A node in a search tree. Contains a pointer to the parent (the node
+    that this is a successor of) and to the actual state for this node. Note
+    that if a state is arrived at by two paths, then there are two nodes with
+    the same state. Also includes the action that got us to this state, and
+    the total path_cost (also known as g) to reach the node. Other functions
+    may add an f and h value; see best_first_graph_search and astar_search for
+    an explanation of how the f and h values are handled. You will not need to
+    subclass this class.
+    Nodes are slotted, as searches create one for every generated child: f
+    and h have slots of their own but stay unset until memoize stores them."""
+
+    __slots__ = ('state', 'parent', 'action', 'path_cost', 'depth', 'f', 'h')
+
+    def __init__(self, state, parent=None, action=None, path_cost=0):
+        """Create a search tree Node, derived from a parent by an action."""
+        self.state = state
+        self.parent = parent
+        self.action = action
+        self.path_cost = path_cost
+        self.depth = 0
+        if parent:
+            self.depth = parent.depth + 1
+
+    def __repr__(self):
+        return "<Node {}>".format(self.state)
+
+    def __lt__(self, node):
+        return self.state < node.state
+
+    def expand(self, problem):
+        """Yield the nodes reachable in one step from this node, one at a
+        time, so a search that stops early never builds the rest."""
+        for action in problem.actions(self.state):
+            yield self.child_node(problem, action)
+
+    def child_node(self, problem, action):
+        """[Figure 3.10]"""
+        next_state = problem.result(self.state, action)
+        next_node = Node(next_state, self, action, problem.path_cost(self.path_cost, self.state, action, next_state))
+        return next_node
+
+    def solution(self):
+        """Return the sequence of actions to go from the root to this node."""
+        return [node.action for node in self.path()[1:]]
+
+    def path(self):
+        """Return a list of nodes forming the path from the root to this node."""
+        node, path_back = self, []
+        while node:
+            path_back.append(node)
+            node = node.parent
+        return list(reversed(path_back))
+
+    # We want for a queue of nodes in breadth_first_graph_search or
+    # astar_search to have no duplicated states, so we treat nodes
+    # with the same state as equal. [Problem: this may not be what you
+    # want in other contexts.]
+
+    def __eq__(self, other):
+        return isinstance(other, Node) and self.state == other.state
+
+    def __hash__(self):
+        # We use the hash value of the state
+        # stored in the node instead of the node
+        # object itself to quickly search a node
+        # with the same state in a Hash Table
+        return hash(self.state)
+
+
+class SearchStats:
+    """Counters a search fills in when it is given stats=SearchStats(), the
+    same way for every search:
+    expanded: nodes whose children were generated
+    generated: children generated
+    pruned: children dropped as duplicates, their state being explored
+        or on the frontier already at no more cost (in IDA*, on the path
+        or a cheaper transposition)
+    decrease_keys: children that replaced a costlier frontier entry
+    max_frontier: peak number of frontier entries, counting the stale
+        entries left in heaps by lazy deletion as they take memory too
+    max_explored: peak size of the explored set (in IDA*, of the
+        transposition table)
+    heuristic_calls: evaluations of the heuristic (f, in
+        best_first_graph_search), at most one per node as they are memoized
+    Searches without stats only pay for checking that it is None once per
+    expansion or pruned child. One SearchStats can be given to several
+    searches to add their counts up; the peaks are then the largest."""
+
+    __slots__ = ('expanded', 'generated', 'pruned', 'decrease_keys', 'max_frontier', 'max_explored',
+                 'heuristic_calls')
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def __repr__(self):
+        return "<SearchStats {}>".format(" ".join(f"{name}={value}" for name, value in self.as_dict().items()))
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def expand(self, node, problem):
+        """Yield node.expand(problem), counting the expansion and the
+        children generated; searches call it in place of Node.expand."""
+        self.expanded += 1
+        for child in node.expand(problem):
+            self.generated += 1
+            yield child
+
+    def counted(self, h):
+        """Return h, counting its calls as heuristic evaluations."""
+        def counted_h(*args):
+            self.heuristic_calls += 1
+            return h(*args)
+        return counted_h
+
+    def observe(self, frontier, explored):
+        """Record the frontier and explored sizes, if they are new peaks."""
+        if frontier > self.max_frontier:
+            self.max_frontier = frontier
+        if explored > self.max_explored:
+            self.max_explored = explored
+
+
+class SearchBudget:
+    """Limits on a search, given as budget=SearchBudget(...): at most
+    max_expansions nodes expanded, time_limit seconds, and max_frontier
+    and max_explored entries in the frontier and explored set (in IDA*,
+    the depth-first stack and the transposition table). A search that
+    goes over a limit raises BudgetExceeded. Only the expansion count is
+    compared in the search loop; the clock and the sizes are checked
+    every interval expansions, so a search may run interval expansions
+    past the time or size limits."""
+
+    __slots__ = ('max_expansions', 'time_limit', 'max_frontier', 'max_explored', 'interval')
+
+    def __init__(self, max_expansions=None, time_limit=None, max_frontier=None, max_explored=None, interval=128):
+        self.max_expansions = max_expansions
+        self.time_limit = time_limit
+        self.max_frontier = max_frontier
+        self.max_explored = max_explored
+        self.interval = interval
+
+    def __repr__(self):
+        limits = (f"{name}={getattr(self, name)}" for name in self.__slots__[:4] if getattr(self, name) is not None)
+        return "<SearchBudget {}>".format(" ".join(limits))
+
+    def next_check(self, expanded):
+        """Return the expansion count at which a search should call check."""
+        if self.max_expansions is not None:
+            return min(expanded + self.interval, self.max_expansions + 1)
+        return expanded + self.interval
+
+    def check(self, expanded, frontier, explored, start_time, stats=None):
+        """Raise BudgetExceeded if a search that started at start_time (by
+        time.perf_counter), now expanding its expanded-th node with frontier
+        and explored entries, is over a limit, else return the next_check."""
+        runtime = (time.perf_counter() - start_time) * 1000
+        if stats is not None:
+            stats.observe(frontier, explored)
+        for reason, over in (("expansions", self.max_expansions is not None and expanded > self.max_expansions),
+                             ("time", self.time_limit is not None and runtime > self.time_limit * 1000),
+                             ("frontier", self.max_frontier is not None and frontier > self.max_frontier),
+                             ("explored", self.max_explored is not None and explored > self.max_explored)):
+            if over:
+                # The node being expanded is not, so expanded - 1 were
+                raise BudgetExceeded(reason, expanded - 1, runtime, stats)
+        return self.next_check(expanded)
+
+
+class BudgetExceeded(Exception):
+    """Raised by a search that went over a limit of its SearchBudget:
+    reason is the limit ("expansions", "time", "frontier" or "explored"),
+    expanded the nodes expanded and runtime the ms spent until then, and
+    stats the search's SearchStats (or None), as gathered so far."""
+
+    def __init__(self, reason, expanded, runtime, stats=None):
+        super().__init__(f"search budget exceeded: {reason} after {expanded} expansions and {runtime:.2f} ms")
+        self.reason = reason
+        self.expanded = expanded
+        self.runtime = runtime
+        self.stats = stats
+
+
+def depth_first_graph_search(problem, reuse_explored=False, stats=None, budget=None):
+    """
+    [Figure 3.7]
+    Search the deepest nodes in the search tree first.
+    Search through the successors of a problem to find a goal.
+    The argument frontier should be an empty queue.
+    Does not get trapped by loops.
+    If two paths reach a state, only use the first one.
+    The states on the stack are mirrored in a set so that checking a child
+    against the frontier is O(1). With reuse_explored, states go into the
+    explored set as soon as they are generated instead, so one set serves
+    both checks.
+    Counts are added to stats, a SearchStats, if given, and the search
+    stops at the limits of budget, a SearchBudget, if given.
+    """
+    expand = Node.expand if stats is None else stats.expand
+    frontier = [(Node(problem.initial))]  # Stack
+    explored = set()
+    frontier_states = explored if reuse_explored else set()
+    frontier_states.add(problem.initial)
+    nodes_expanded = 0
+    start_time = time.perf_counter()
+    check_at = math.inf if budget is None else budget.next_check(0)
+    while frontier:
+        if stats is not None:
+            stats.observe(len(frontier), len(explored))
+        node = frontier.pop()
+        if problem.goal_test(node.state):
+            return node, nodes_expanded, (time.perf_counter() - start_time) * 1000
+        if not reuse_explored:
+            frontier_states.remove(node.state)
+        explored.add(node.state)
+        nodes_expanded += 1
+        if nodes_expanded >= check_at:
+            check_at = budget.check(nodes_expanded, len(frontier), len(explored), start_time, stats)
+        for child in expand(node, problem):
+            if child.state not in explored and child.state not in frontier_states:
+                frontier.append(child)
+                frontier_states.add(child.state)
+            elif stats is not None:
+                stats.pruned += 1
+    return None, nodes_expanded, (time.perf_counter() - start_time) * 1000
+
+
+def breadth_first_graph_search(problem, reuse_explored=False, stats=None, budget=None):
+    """[Figure 3.11]
+    Note that this function can be implemented in a
+    single line as below:
+    return graph_search(problem, FIFOQueue())
+    The states in the queue are mirrored in a set so that checking a child
+    against the frontier is O(1). With reuse_explored, states go into the
+    explored set as soon as they are generated instead, so one set serves
+    both checks.
+    Counts are added to stats, a SearchStats, if given, and the search
+    stops at the limits of budget, a SearchBudget, if given.
+    """
+    expand = Node.expand if stats is None else stats.expand
+    start_time = time.perf_counter()
+    node = Node(problem.initial)
+    explored = set()
+    nodes_expanded = 0
+    if problem.goal_test(node.state):
+        return node, nodes_expanded, (time.perf_counter() - start_time) * 1000
+    frontier = deque([node])
+    frontier_states = explored if reuse_explored else set()
+    frontier_states.add(node.state)
+    check_at = math.inf if budget is None else budget.next_check(0)
+    
+    while frontier:
+        if stats is not None:
+            stats.observe(len(frontier), len(explored))
+        node = frontier.popleft()
+        if not reuse_explored:
+            frontier_states.remove(node.state)
+        explored.add(node.state)
+        nodes_expanded += 1
+        if nodes_expanded >= check_at:
+            check_at = budget.check(nodes_expanded, len(frontier), len(explored), start_time, stats)
+        for child in expand(node, problem):
+            if child.state not in explored and child.state not in frontier_states:
+                if problem.goal_test(child.state):
+                    if stats is not None:
+                        stats.observe(len(frontier), len(explored))
+                    return child, nodes_expanded, (time.perf_counter() - start_time) * 1000
+                frontier.append(child)
+                frontier_states.add(child.state)
+            elif stats is not None:
+                stats.pruned += 1
+    return None, nodes_expanded, (time.perf_counter() - start_time) * 1000
+
+def uniform_cost_search(problem, stats=None, budget=None):
+    """Expands the node with the lowest total path cost.
+    This is Dijkstra's algorithm with lazy deletion: best_cost keeps the
+    cheapest known cost of every generated state, a cheaper path to a state
+    is pushed as a new frontier entry (a decrease-key, in stats), and the
+    outdated entry is skipped when it is eventually popped.
+    Counts are added to stats, a SearchStats, if given, and the search
+    stops at the limits of budget, a SearchBudget, if given."""
+    expand = Node.expand if stats is None else stats.expand
+    start_time = time.perf_counter()
+    node = Node(problem.initial)
+    explored = set()
+    if problem.goal_test(node.state):
+        return node, 0, (time.perf_counter() - start_time) * 1000
+
+    frontier = []
+    heapq.heappush(frontier, (node.path_cost, node))
+    best_cost = {node.state: node.path_cost}
+    nodes_expanded = 0
+    check_at = math.inf if budget is None else budget.next_check(0)
+
+    while frontier:
+        if stats is not None:
+            stats.observe(len(frontier), len(explored))
+        cost, node = heapq.heappop(frontier)
+        if node.state in explored:
+            continue  # Stale entry, the state was reached more cheaply
+
+        nodes_expanded += 1
+
+        if problem.goal_test(node.state):
+            return node, nodes_expanded, (time.perf_counter() - start_time) * 1000 
+
+        explored.add(node.state)
+        if nodes_expanded >= check_at:
+            check_at = budget.check(nodes_expanded, len(frontier), len(explored), start_time, stats)
+
+        for child in expand(node, problem):
+            if child.state not in explored and child.path_cost < best_cost.get(child.state, math.inf):
+                if stats is not None and child.state in best_cost:
+                    stats.decrease_keys += 1
+                best_cost[child.state] = child.path_cost
+                heapq.heappush(frontier, (child.path_cost, child))
+            elif stats is not None:
+                stats.pruned += 1
+
+    return None, nodes_expanded, (time.perf_counter() - start_time) * 1000
+
+def best_first_graph_search(problem, f, display=False, stats=None, budget=None):
+    """Search the nodes with the lowest f scores first.
+    You specify the function f(node) that you want to minimize; for example,
+    if f is a heuristic estimate to the goal, then we have greedy best
+    first search; if f is node.depth then we have breadth-first search.
+    There is a subtlety: the line "f = memoize(f, 'f')" means that the f
+    values will be cached on the nodes as they are computed. So after doing
+    a best first search you can examine the f values of the path returned.
+    Counts are added to stats, a SearchStats, if given, and the search
+    stops at the limits of budget, a SearchBudget, if given."""
+    expand = Node.expand if stats is None else stats.expand
+    if stats is not None:
+        f = stats.counted(f)
+    f = memoize(f, 'f')
+    node = Node(problem.initial)
+    frontier = IndexedPriorityQueue('min', f)
+    frontier.append(node)
+    explored = set()
+    start_time = time.perf_counter()
+    check_at = math.inf if budget is None else budget.next_check(0)
+    while frontier:
+        if stats is not None:
+            stats.observe(len(frontier.heap), len(explored))
+        node = frontier.pop()
+        if problem.goal_test(node.state):
+            if display:
+                print(len(explored), "paths have been expanded and", len(frontier), "paths remain in the frontier")
+            return node, len(explored), (time.perf_counter() - start_time) * 1000
+        explored.add(node.state)
+        if len(explored) >= check_at:
+            check_at = budget.check(len(explored), len(frontier.heap), len(explored), start_time, stats)
+        for child in expand(node, problem):
+            if child.state not in explored and child not in frontier:
+                frontier.append(child)
+            elif child in frontier:
+                if f(child) < frontier[child]:
+                    frontier.decrease_key(child)
+                    if stats is not None:
+                        stats.decrease_keys += 1
+                elif stats is not None:
+                    stats.pruned += 1
+            elif stats is not None:
+                stats.pruned += 1
+    return None, len(explored), (time.perf_counter() - start_time) * 1000
+
+# ______________________________________________________________________________
+# Informed (Heuristic) Search
+
+
+greedy_best_first_graph_search = best_first_graph_search
+
+
+# Greedy best-first search is accomplished by specifying f(n) = h(n).
+
+
+def astar_search(problem, h=None, display=False, stats=None, budget=None):
+    """A* search is best-first graph search with f(n) = g(n)+h(n).
+    You need to specify the h function when you call astar_search, or
+    else in your Problem subclass."""
+    h = memoize(h or problem.h, 'h')
+    return best_first_graph_search(problem, lambda n: n.path_cost + h(n), display, stats, budget)
+
+
+def anytime_astar_search(problem, h=None, weight=3.0, step=0.5, display=False, stats=None, budget=None):
+    """Anytime repairing A* (ARA*): a series of weighted A* searches with
+    f(n) = g(n) + w*h(n), starting at w = weight and lowering w by step
+    down to 1 (plain A*), that reuse each other's work. Every search
+    stops as soon as no frontier node can improve on the best solution
+    so far; the cheapest known path to every state is kept, states that
+    get cheaper after being expanded wait in an inconsistent list, and
+    only those and the rest of the frontier are searched again with the
+    next weight, instead of starting over from the initial state.
+    This is a generator: it yields (node, nodes explored, runtime in ms,
+    bound) for every better solution, or tighter bound, it finds, where
+    the solution costs at most bound times the optimal cost (for a
+    consistent h); the last has bound 1, an optimal solution, or it
+    yields (None, nodes explored, runtime, inf) once if there is none.
+    To answer within a deadline, stop iterating or pass a budget, a
+    SearchBudget (BudgetExceeded is then raised), and keep the last
+    node yielded. Counts are added to stats, a SearchStats, if given."""
+    expand = Node.expand if stats is None else stats.expand
+    h = h or problem.h
+    if stats is not None:
+        h = stats.counted(h)
+    start_time = time.perf_counter()
+    node = Node(problem.initial)
+    if problem.goal_test(node.state):
+        yield node, 0, (time.perf_counter() - start_time) * 1000, 1.0
+        return
+
+    h_values = {node.state: h(node)}  # h depends on the state alone
+    best = {node.state: node}  # The cheapest known path to every generated state
+    frontier = [(weight * h_values[node.state], node)]  # Lazy deletion, like uniform_cost_search
+    open_states = {node.state}
+    inconsistent = {}
+    explored = set()
+    solution, cost, bound = None, math.inf, math.inf
+    nodes_expanded = 0
+    check_at = math.inf if budget is None else budget.next_check(0)
+
+    while True:
+        while frontier and frontier[0][0] < cost:
+            if stats is not None:
+                stats.observe(len(frontier), len(explored))
+            _, node = heapq.heappop(frontier)
+            if node.state not in open_states or best[node.state] is not node:
+                continue  # Stale entry, the state was reached more cheaply or expanded
+            open_states.remove(node.state)
+            explored.add(node.state)
+            nodes_expanded += 1
+            if nodes_expanded >= check_at:
+                check_at = budget.check(nodes_expanded, len(frontier), len(explored), start_time, stats)
+
+            for child in expand(node, problem):
+                known = best.get(child.state)
+                if known is not None and child.path_cost >= known.path_cost:
+                    if stats is not None:
+                        stats.pruned += 1
+                    continue
+                if known is None:
+                    h_values[child.state] = h(child)
+                elif stats is not None:
+                    stats.decrease_keys += 1
+                best[child.state] = child
+                if problem.goal_test(child.state) and child.path_cost < cost:
+                    solution, cost = child, child.path_cost
+                if child.state in explored:
+                    inconsistent[child.state] = child
+                else:
+                    open_states.add(child.state)
+                    heapq.heappush(frontier, (child.path_cost + weight * h_values[child.state], child))
+
+        if solution is None:
+            yield None, nodes_expanded, (time.perf_counter() - start_time) * 1000, math.inf
+            return
+        # The optimal cost is at least the lowest g + h of any state still to be searched
+        lower = min((best[state].path_cost + h_values[state] for state in open_states.union(inconsistent)),
+                    default=cost)
+        new_bound = min(weight, cost / lower) if lower > 0 else weight
+        if new_bound < bound:
+            bound = new_bound
+            if display:
+                print(f"Weight {weight:g}: cost {cost}, at most {bound:.3f} times the optimal,",
+                      nodes_expanded, "paths expanded so far")
+            yield solution, nodes_expanded, (time.perf_counter() - start_time) * 1000, bound
+        if bound <= 1 or weight <= 1:
+            return
+
+        weight = max(1.0, weight - step)
+        open_states.update(inconsistent)
+        inconsistent.clear()
+        explored.clear()
+        frontier = [(best[state].path_cost + weight * h_values[state], best[state]) for state in open_states]
+        heapq.heapify(frontier)
+
+
+# ______________________________________________________________________________
+
+
+def iterative_deepening_astar_search(problem, h=None, table_size=0, display=False, stats=None, budget=None):
+    """Iterative deepening A* search (IDA*).
+    Each iteration is a depth-first search that cuts off every node whose
+    f = g + h is over the f-limit; the next f-limit is the smallest f that
+    was cut off. The depth-first search keeps an explicit stack of child
+    iterators, so deep graphs do not hit the recursion limit, and a dict of
+    the states on the current path, so cycles are pruned in O(1).
+    With table_size, a transposition table of up to that many states keeps,
+    for each state, the cheapest g it was expanded at in this iteration
+    (costlier transpositions are pruned) and the f-bound backed up from its
+    subtree, which later iterations use in place of a smaller f. Bounds are
+    only kept for subtrees that were searched without pruning a move to a
+    state on the path (the node itself included) or a transposition: bounds
+    backed up through cycles can feed each other, rising every iteration
+    without ever reaching inf when no goal is reachable. So the table also
+    tracks the states that were generated but never expanded: once none
+    are left, every reachable state has been expanded without reaching a
+    goal, and the search returns None. Once the table is full that cannot
+    be told any more, and its bounds are no longer raised instead, which
+    leaves finitely many f values, so the search still ends.
+    With display, print how many nodes each iteration visited, expanded,
+    and re-expanded (expanded again after an earlier iteration).
+    Counts are added to stats, a SearchStats, if given, and the search
+    stops at the limits of budget, a SearchBudget, if given; every
+    iteration's expansions count, and the frontier is the depth-first
+    stack."""
+    expand = Node.expand if stats is None else stats.expand
+    h = h or problem.h
+    if stats is not None:
+        h = stats.counted(h)
+    h = memoize(h, 'h')
+    table = {}  # state -> [g, iteration it was expanded in, backed-up h]
+    unexpanded = set()  # States cut off by an f-limit that were never expanded
+    table_full = False
+
+    def f(node):
+        entry = table.get(node.state)
+        if entry:
+            return node.path_cost + max(h(node), entry[2])
+        return node.path_cost + h(node)
+
+    def contour_search(root, f_limit, last_limit, iteration):
+        """Depth-first search from root up to f_limit. Return the goal node
+        (or None), the smallest f over f_limit, and the number of nodes
+        visited, expanded, and expanded with f within last_limit."""
+        nonlocal check_at, table_full
+        visited, expanded, re_expanded = 1, 1, 0
+        if total_expanded + expanded >= check_at:
+            check_at = budget.check(total_expanded + expanded, 1, len(table), start_time, stats)
+        on_path = {root.state: root.depth}
+        # Frames are [node, children, smallest f cut off below node,
+        #             whether a move below node was pruned]
+        root_frame = [root, iter(expand(root, problem)), math.inf, False]
+        stack = [root_frame]
+        if stats is not None:
+            stats.observe(len(stack), len(table))
+        while stack:
+            frame = stack[-1]
+            node, children = frame[0], frame[1]
+            child = next(children, None)
+
+            if child is None:
+                stack.pop()
+                del on_path[node.state]
+                if table_size and not frame[3] and not table_full and node.state in table:
+                    entry = table[node.state]
+                    entry[2] = max(entry[2], frame[2] - node.path_cost)
+                if stack:
+                    stack[-1][2] = min(stack[-1][2], frame[2])
+                    stack[-1][3] = stack[-1][3] or frame[3]
+                continue
+
+            if child.state in on_path:
+                frame[3] = True
+                if stats is not None:
+                    stats.pruned += 1
+                continue
+            if table_size:
+                entry = table.get(child.state)
+                if entry and entry[1] == iteration and entry[0] <= child.path_cost:
+                    frame[3] = True
+                    if stats is not None:
+                        stats.pruned += 1
+                    continue
+
+            visited += 1
+            f_value = f(child)
+            if f_value > f_limit:
+                frame[2] = min(frame[2], f_value)
+                if table_size and child.state not in table:
+                    unexpanded.add(child.state)
+                continue
+            if problem.goal_test(child.state):
+                return child, None, visited, expanded, re_expanded
+
+            expanded += 1
+            if f_value <= last_limit:
+                re_expanded += 1
+            if total_expanded + expanded >= check_at:
+                check_at = budget.check(total_expanded + expanded, len(stack), len(table), start_time, stats)
+            if table_size:
+                entry = table.get(child.state)
+                if entry:
+                    entry[0], entry[1] = child.path_cost, iteration
+                elif len(table) < table_size:
+                    table[child.state] = [child.path_cost, iteration, 0]
+                    unexpanded.discard(child.state)
+                else:
+                    table_full = True
+            on_path[child.state] = child.depth
+            stack.append([child, iter(expand(child, problem)), math.inf, False])
+            if stats is not None:
+                stats.observe(len(stack), len(table))
+
+        return None, root_frame[2], visited, expanded, re_expanded
+
+    initial_node = Node(problem.initial)
+    threshold = f(initial_node)
+    total_nodes_explored = total_expanded = 0
+    start_time = time.perf_counter()
+    check_at = math.inf if budget is None else budget.next_check(0)
+    
+    if problem.goal_test(initial_node.state):
+        return initial_node, total_nodes_explored, (time.perf_counter() - start_time) * 1000
+
+    last_threshold = -math.inf
+    iteration = 0
+    while True:
+        iteration += 1
+        result, next_threshold, visited, expanded, re_expanded = contour_search(
+            initial_node, threshold, last_threshold, iteration)
+        total_nodes_explored += visited
+        total_expanded += expanded
+        if display:
+            print(f"Iteration {iteration}: f-limit {threshold}, {visited} visited, "
+                  f"{expanded} expanded, {re_expanded} re-expanded")
+
+        if result is not None:
+            return result, total_nodes_explored, (time.perf_counter() - start_time) * 1000
+            
+        if next_threshold == math.inf or (table_size and not table_full and not unexpanded):
+            return None, total_nodes_explored, (time.perf_counter() - start_time) * 1000
+            
+        last_threshold, threshold = threshold, next_threshold
@@ -0,0 +1,179 @@
+"""
+Many-to-many distance tables.
+"""
+
+import heapq
+import os
+
+from .utils import np
+
+
+# ______________________________________________________________________________
+# Distance Tables
+
+
+class DistanceTable:
+    """The costs of the cheapest paths from each of sources to each of
+    targets, as a float32 matrix costs[i, j] (inf where there is no path).
+    predecessors[i, v] is the id (index into nodes) of the node before
+    nodes[v] on the cheapest path from sources[i], or -1, for every node,
+    so the path from a source to any node can be rebuilt on demand.
+    Built by distance_table(). save() writes the matrices as .npy files
+    which load() memory-maps back, so only the rows used are read.
+        table = distance_table(graph, depots, stops)
+        table.cost(depot, stop), table.path(depot, stop)"""
+
+    def __init__(self, nodes, sources, targets, costs, predecessors=None):
+        self.nodes = list(nodes)
+        self.sources = list(sources)
+        self.targets = list(targets)
+        self.costs = costs
+        self.predecessors = predecessors
+        self.source_index = {source: i for i, source in enumerate(self.sources)}
+        self.target_index = {target: j for j, target in enumerate(self.targets)}
+        self.index = None
+
+    def cost(self, source, target):
+        """Return the cost of the cheapest path from source to target."""
+        return float(self.costs[self.source_index[source], self.target_index[target]])
+
+    def path(self, source, target):
+        """Return the list of states on the cheapest path from source to
+        target (any node), or None if there is none."""
+        if self.predecessors is None:
+            raise ValueError("The table was built without predecessors")
+        if self.index is None:
+            self.index = {node: v for v, node in enumerate(self.nodes)}
+        row = self.predecessors[self.source_index[source]]
+        v = self.index[target]
+        states = [target]
+        while states[-1] != source:
+            v = int(row[v])
+            if v < 0:
+                return None
+            states.append(self.nodes[v])
+        return states[::-1]
+
+    @staticmethod
+    def files(prefix):
+        """Return the names of the costs, predecessors and labels files."""
+        return prefix + '.costs.npy', prefix + '.predecessors.npy', prefix + '.labels.npz'
+
+    def save(self, prefix):
+        """Save the table as {prefix}.costs.npy, {prefix}.predecessors.npy
+        and the node labels in {prefix}.labels.npz."""
+        costs_file, predecessors_file, labels_file = self.files(prefix)
+        if getattr(self.costs, 'filename', None) != os.path.abspath(costs_file):
+            np.save(costs_file, self.costs)
+        if self.predecessors is not None and \
+                getattr(self.predecessors, 'filename', None) != os.path.abspath(predecessors_file):
+            np.save(predecessors_file, self.predecessors)
+        np.savez(labels_file, nodes=np.array(self.nodes), sources=np.array(self.sources),
+                 targets=np.array(self.targets))
+
+    @classmethod
+    def load(cls, prefix, mmap_mode='r'):
+        """Load a table saved with save(), memory-mapping the matrices."""
+        costs_file, predecessors_file, labels_file = cls.files(prefix)
+        predecessors = np.load(predecessors_file, mmap_mode=mmap_mode) if os.path.exists(predecessors_file) else None
+        with np.load(labels_file) as labels:
+            return cls(labels['nodes'].tolist(), labels['sources'].tolist(), labels['targets'].tolist(),
+                       np.load(costs_file, mmap_mode=mmap_mode), predecessors)
+
+
+FLOYD_WARSHALL_MAX_NODES = 1500
+FLOYD_WARSHALL_MIN_DENSITY = 0.05
+
+
+def floyd_warshall(graph):
+    """Return the n x n cheapest path costs between all node ids of a
+    CSRGraph and the matching predecessor ids (-1 for none), by the
+    Floyd-Warshall algorithm with each of the n min-plus steps done on the
+    whole matrix at once. Takes O(n^3) time and O(n^2) memory."""
+    n = len(graph.labels)
+    costs = np.full((n, n), np.inf)
+    predecessors = np.full((n, n), -1, dtype=np.int32)
+    sources = np.repeat(np.arange(n), np.diff(graph.offsets))
+    costs[sources, graph.targets] = graph.costs
+    predecessors[sources, graph.targets] = sources
+    costs[np.arange(n), np.arange(n)] = 0
+    predecessors[np.arange(n), np.arange(n)] = -1
+    for k in range(n):
+        through_k = costs[:, k, None] + costs[k]
+        better = through_k < costs
+        costs[better] = through_k[better]
+        predecessors[better] = np.broadcast_to(predecessors[k], (n, n))[better]
+    return costs, predecessors
+
+
+def distance_table(graph, sources=None, targets=None, method=None, predecessors=True, prefix=None, block=64):
+    """Return a DistanceTable of the cheapest path costs from each of
+    sources to each of targets (all nodes by default) in graph.
+    method is 'floyd_warshall' or 'dijkstra' (one single-source search per
+    source); by default Floyd-Warshall is used for graphs of at most
+    FLOYD_WARSHALL_MAX_NODES nodes with links between at least
+    FLOYD_WARSHALL_MIN_DENSITY of all pairs. With prefix, the matrices are
+    written straight to the files save() would use, block source rows at a
+    time, so the table never has to fit in memory."""
+    graph = graph.freeze()
+    nodes = graph.nodes()
+    n = len(nodes)
+    sources = nodes if sources is None else list(sources)
+    targets = nodes if targets is None else list(targets)
+    source_ids = np.array([graph.index[source] for source in sources], dtype=np.int64)
+    target_ids = np.array([graph.index[target] for target in targets], dtype=np.int64)
+    if method is None:
+        dense = len(graph.targets) >= FLOYD_WARSHALL_MIN_DENSITY * n * n
+        method = 'floyd_warshall' if n <= FLOYD_WARSHALL_MAX_NODES and dense else 'dijkstra'
+
+    shape = (len(sources), len(targets))
+    if prefix is None:
+        costs = np.empty(shape, dtype=np.float32)
+        predecessor_ids = np.empty((len(sources), n), dtype=np.int32) if predecessors else None
+    else:
+        costs_file, predecessors_file, _ = DistanceTable.files(prefix)
+        costs = np.lib.format.open_memmap(costs_file, mode='w+', dtype=np.float32, shape=shape)
+        predecessor_ids = np.lib.format.open_memmap(predecessors_file, mode='w+', dtype=np.int32,
+                                                    shape=(len(sources), n)) if predecessors else None
+
+    if method == 'floyd_warshall':
+        all_costs, all_predecessors = floyd_warshall(graph)
+        costs[:] = all_costs[np.ix_(source_ids, target_ids)]
+        if predecessors:
+            predecessor_ids[:] = all_predecessors[source_ids]
+    elif method == 'dijkstra':
+        offsets, links, lengths = graph.offsets.tolist(), graph.targets.tolist(), graph.costs.tolist()
+
+        def tree(source):
+            """Dijkstra from node id source over the CSR lists."""
+            cost_to, parent = [np.inf] * n, [-1] * n
+            settled = [False] * n
+            cost_to[source] = 0
+            frontier = [(0, source)]
+            while frontier:
+                cost, a = heapq.heappop(frontier)
+                if settled[a]:
+                    continue
+                settled[a] = True
+                for k in range(offsets[a], offsets[a + 1]):
+                    b, new_cost = links[k], cost + lengths[k]
+                    if new_cost < cost_to[b]:
+                        cost_to[b], parent[b] = new_cost, a
+                        heapq.heappush(frontier, (new_cost, b))
+            return cost_to, parent
+
+        for start in range(0, len(sources), block):
+            rows = [tree(source) for source in source_ids[start:start + block].tolist()]
+            costs[start:start + len(rows)] = np.array([cost_to for cost_to, _ in rows])[:, target_ids]
+            if predecessors:
+                predecessor_ids[start:start + len(rows)] = [parent for _, parent in rows]
+    else:
+        raise ValueError(f"Unsupported method: {method}")
+
+    table = DistanceTable(nodes, sources, targets, costs, predecessor_ids)
+    if prefix is not None:
+        costs.flush()
+        if predecessors:
+            predecessor_ids.flush()
+        table.save(prefix)
+    return table
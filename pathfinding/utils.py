@@ -0,0 +1,178 @@
+"""
+Helpers shared by the pathfinding modules: the priority queues, memoize,
+and np, which stands in for NumPy and only imports it the first time one
+of its attributes is used, so importing the package stays cheap.
+"""
+
+import functools
+import heapq
+import importlib
+
+
+class LazyModule:
+    """A stand-in for a module that is imported on first attribute access.
+    Attributes are kept on the stand-in once looked up, so later lookups
+    cost the same as on the module itself."""
+
+    def __init__(self, name):
+        self.__name = name
+
+    def __getattr__(self, attr):
+        value = getattr(importlib.import_module(self.__name), attr)
+        setattr(self, attr, value)
+        return value
+
+
+np = LazyModule('numpy')
+
+
+# ______________________________________________________________________________
+# Functions on Objects
+
+
+def memoize(fn, slot=None, maxsize=32):
+    """Memoize fn: make it remember the computed value for any argument list.
+    If slot is specified, store result in that slot of first argument.
+    If slot is false, use lru_cache for caching the values."""
+    if slot:
+        def memoized_fn(obj, *args):
+            if hasattr(obj, slot):
+                return getattr(obj, slot)
+            else:
+                val = fn(obj, *args)
+                setattr(obj, slot, val)
+                return val
+    else:
+        @functools.lru_cache(maxsize=maxsize)
+        def memoized_fn(*args):
+            return fn(*args)
+
+    return memoized_fn
+
+
+# ______________________________________________________________________________
+# Queues: Stack, FIFOQueue, PriorityQueue
+# Stack and FIFOQueue are implemented as list and collection.deque
+# PriorityQueue and IndexedPriorityQueue are implemented here
+
+
+class PriorityQueue:
+    """A Queue in which the minimum (or maximum) element (as determined by f and
+    order) is returned first.
+    If order is 'min', the item with minimum f(x) is
+    returned first; if order is 'max', then it is the item with maximum f(x).
+    Also supports dict-like lookup."""
+
+    def __init__(self, order='min', f=lambda x: x):
+        self.heap = []
+        if order == 'min':
+            self.f = f
+        elif order == 'max':  # now item with max f(x)
+            self.f = lambda x: -f(x)  # will be popped first
+        else:
+            raise ValueError("Order must be either 'min' or 'max'.")
+
+    def append(self, item):
+        """Insert item at its correct position."""
+        heapq.heappush(self.heap, (self.f(item), item))
+
+    def extend(self, items):
+        """Insert each item in items at its correct position."""
+        for item in items:
+            self.append(item)
+
+    def pop(self):
+        """Pop and return the item (with min or max f(x) value)
+        depending on the order."""
+        if self.heap:
+            return heapq.heappop(self.heap)[1]
+        else:
+            raise Exception('Trying to pop from empty PriorityQueue.')
+
+    def __len__(self):
+        """Return current capacity of PriorityQueue."""
+        return len(self.heap)
+
+    def __contains__(self, key):
+        """Return True if the key is in PriorityQueue."""
+        return any([item == key for _, item in self.heap])
+
+    def __getitem__(self, key):
+        """Returns the first value associated with key in PriorityQueue.
+        Raises KeyError if key is not present."""
+        for value, item in self.heap:
+            if item == key:
+                return value
+        raise KeyError(str(key) + " is not in the priority queue")
+
+    def __delitem__(self, key):
+        """Delete the first occurrence of key."""
+        try:
+            del self.heap[[item == key for _, item in self.heap].index(True)]
+        except ValueError:
+            raise KeyError(str(key) + " is not in the priority queue")
+        heapq.heapify(self.heap)
+
+
+class IndexedPriorityQueue(PriorityQueue):
+    """A PriorityQueue that also keeps an item -> heap entry index, so that
+    membership, priority lookup and deletion are O(1) and replacing the
+    priority of an item (decrease-key) is a single O(log n) push.
+    Deleted or replaced entries are marked dead and left in the heap; they
+    are skipped when they reach the top (lazy deletion).
+    Items are indexed by hash, so equal items (e.g. Nodes with the same
+    state) share one slot in the queue."""
+
+    def __init__(self, order='min', f=lambda x: x):
+        super().__init__(order, f)
+        self.entries = {}
+
+    def append(self, item):
+        """Insert item at its correct position, replacing any equal item."""
+        if item in self.entries:
+            self.entries[item][2] = False
+        entry = [self.f(item), item, True]
+        self.entries[item] = entry
+        heapq.heappush(self.heap, entry)
+        # Drop dead entries once they outnumber the live ones
+        if len(self.heap) > 2 * len(self.entries) + 32:
+            self.heap = [e for e in self.heap if e[2]]
+            heapq.heapify(self.heap)
+
+    def decrease_key(self, item):
+        """Re-prioritise item, which should have a better f(x) than the
+        equal item currently in the queue."""
+        self.append(item)
+
+    def pop(self):
+        """Pop and return the item (with min or max f(x) value)
+        depending on the order."""
+        while self.heap:
+            value, item, live = heapq.heappop(self.heap)
+            if live:
+                del self.entries[item]
+                return item
+        raise Exception('Trying to pop from empty PriorityQueue.')
+
+    def __len__(self):
+        """Return current capacity of PriorityQueue."""
+        return len(self.entries)
+
+    def __contains__(self, key):
+        """Return True if the key is in PriorityQueue."""
+        return key in self.entries
+
+    def __getitem__(self, key):
+        """Returns the value associated with key in PriorityQueue.
+        Raises KeyError if key is not present."""
+        try:
+            return self.entries[key][0]
+        except KeyError:
+            raise KeyError(str(key) + " is not in the priority queue")
+
+    def __delitem__(self, key):
+        """Delete key from the queue."""
+        try:
+            self.entries.pop(key)[2] = False
+        except KeyError:
+            raise KeyError(str(key) + " is not in the priority queue")
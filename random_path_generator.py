@@ -1,148 +1,421 @@
-import random
-import os
-import sys
-import tkinter as tk
-from graph_gui import *
+import argparse
+import collections
+import io
+import itertools
 import math
+import os
+import re
+
+import numpy as np
+
+from pathfinding import GraphContainerWriter
+
+# How each node's number of out-links is drawn: uniformly from 0 to degree,
+# from a Poisson distribution with mean degree, or always degree
+DEGREE_DISTRIBUTIONS = ("uniform", "poisson", "fixed")
+# Which nodes a node links to: any nodes, its nearest nodes, or any nodes
+# within radius of it
+NEIGHBOURS = ("random", "knn", "radius")
+
+
+def random_graph(n_nodes=5, extent=None, degree=3, distribution="uniform", directed_ratio=0.5,
+                 asymmetric_ratio=0.5, neighbours="random", radius=None, max_destinations=None, seed=None):
+
+    # Generate the graph as arrays, then put it in dictionaries and in the text file format
+    coords, sources, targets, costs, origin, destinations = random_graph_arrays(
+        n_nodes, extent, degree, distribution, directed_ratio, asymmetric_ratio, neighbours, radius,
+        max_destinations, np.random.default_rng(seed))
+    nodes = dict(zip(range(1, n_nodes + 1), map(tuple, coords.tolist()))) # {1: (2, 3)}
+    edges = dict(zip(zip(sources.tolist(), targets.tolist()), costs.tolist())) # {(1, 2): 3}
+    text_file_str = graph_text(coords, sources, targets, costs, origin, destinations)
+
+    return nodes, edges, origin, destinations, text_file_str
+
+
+def random_graph_arrays(n_nodes=5, extent=None, degree=3, distribution="uniform", directed_ratio=0.5,
+                        asymmetric_ratio=0.5, neighbours="random", radius=None, max_destinations=None, rng=None):
+    """Generate a random graph of n_nodes nodes, numbered from 1, at distinct
+    integer coordinates from 0 to extent (by default, at least 10 and large
+    enough for about 4 grid points per node). Each node is given a number
+    of out-links from the degree distribution and linked to that many
+    neighbours (see NEIGHBOURS; pairs already linked either way and links to
+    itself are skipped, so some nodes get fewer). A link costs
+    ceil(distance) * 2. With probability 1 - directed_ratio it also gets a
+    link back, which costs one more with probability asymmetric_ratio.
+    The origin is a random node and the destinations 1 to min(n_nodes - 3,
+    max_destinations) other random nodes.
+    Returns (coords, sources, targets, costs, origin, destinations), with
+    the coordinates of node i in coords[i - 1] and a link from sources[j]
+    to targets[j] costing costs[j], in the order the nodes made them."""
+    rng = rng if rng is not None else np.random.default_rng()
+    if extent is None:
+        extent = max(10, math.isqrt(4 * n_nodes))
+    if n_nodes > (extent + 1) ** 2:
+        raise ValueError(f"{n_nodes} nodes do not fit at distinct points from 0 to {extent}")
+
+    # Generate random nodes at distinct coordinates, drawing more points until there are enough
+    cells = np.empty(0, dtype=np.int64)
+    while len(cells) < n_nodes:
+        drawn = np.concatenate([cells, rng.integers(0, (extent + 1) ** 2, n_nodes + n_nodes // 8 + 8)])
+        _, first = np.unique(drawn, return_index=True)
+        cells = drawn[np.sort(first)][:n_nodes]
+    coords = np.stack([cells // (extent + 1), cells % (extent + 1)], axis=1)
+
+    # Draw how many nodes each node links to
+    if distribution == "uniform":
+        degrees = rng.integers(0, degree + 1, n_nodes)
+    elif distribution == "poisson":
+        degrees = rng.poisson(degree, n_nodes)
+    elif distribution == "fixed":
+        degrees = np.full(n_nodes, degree)
+    else:
+        raise ValueError(f"unknown degree distribution {distribution!r}")
+    degrees = np.minimum(degrees, n_nodes - 1)
+
+    # Pick that many neighbours for each node, in node order
+    if neighbours == "random":
+        sources = np.repeat(np.arange(n_nodes), degrees)
+        targets = rng.integers(0, n_nodes, len(sources))
+    elif neighbours in ("knn", "radius"):
+        sources, targets = nearby_pairs(coords, degrees, neighbours, radius, rng)
+    else:
+        raise ValueError(f"unknown neighbours {neighbours!r}")
+
+    # Avoid self-connected: {(x,x):c} and duplicate edges with potentially different cost: {(x,y):c1, (y,x):c2}
+    # The first node to pick a pair keeps it
+    pairs = np.minimum(sources, targets) * n_nodes + np.maximum(sources, targets)
+    _, first = np.unique(pairs, return_index=True)
+    first = np.sort(first)
+    first = first[sources[first] != targets[first]]
+    sources, targets = sources[first], targets[first]
+
+    # Cost rules: ceil(distance)*2 forward, and a back link for undirected pairs, sometimes one more
+    delta = coords[sources] - coords[targets]
+    cost_forward = np.ceil(np.sqrt(delta[:, 0] ** 2 + delta[:, 1] ** 2)).astype(np.int64) * 2
+    undirected = rng.random(len(sources)) >= directed_ratio
+    cost_backward = cost_forward + (rng.random(len(sources)) < asymmetric_ratio)
+
+    # Each back link comes right after its forward link
+    n_links = len(sources) + np.count_nonzero(undirected)
+    position = np.arange(len(sources)) + np.concatenate([[0], np.cumsum(undirected)[:-1]])
+    link_sources = np.empty(n_links, dtype=np.int64)
+    link_targets = np.empty(n_links, dtype=np.int64)
+    link_costs = np.empty(n_links, dtype=np.int64)
+    link_sources[position], link_targets[position], link_costs[position] = sources, targets, cost_forward
+    back = position[undirected] + 1
+    link_sources[back], link_targets[back] = targets[undirected], sources[undirected]
+    link_costs[back] = cost_backward[undirected]
+
+    # Generate random origin node and destinations list, avoiding the origin
+    origin = int(rng.integers(1, n_nodes + 1))
+    most = max(1, n_nodes - 3) if max_destinations is None else max(1, min(n_nodes - 3, max_destinations))
+    number_of_destinations = int(rng.integers(1, most + 1))
+    others = rng.choice(n_nodes - 1, min(number_of_destinations, n_nodes - 1), replace=False) + 1
+    destinations = (others + (others >= origin)).tolist()
+
+    return coords, link_sources + 1, link_targets + 1, link_costs, origin, destinations
+
+
+def nearby_pairs(coords, degrees, neighbours, radius=None, rng=None, block=2 ** 14):
+    """Return (sources, targets) linking each node i (numbered from 0) to
+    degrees[i] nodes near it: its nearest ones for "knn", or random ones
+    within radius for "radius", in node order. Candidates are found with a
+    grid of square cells: the nodes in the 3 x 3 cells around a node, for
+    cells of side radius, or for "knn", of a side holding about (mean
+    degree + 1) / 2 nodes, so the nearest neighbours found are the nearest
+    within that window (nearly always the nearest overall). The nodes are
+    worked through block at a time."""
+    n_nodes = len(coords)
+    if neighbours == "radius":
+        if not radius:
+            raise ValueError("radius neighbours need a radius")
+        cell = float(radius)
+    else:
+        span = max(1, int(np.ptp(coords, axis=0).max()))
+        cell = max(1.0, span * math.sqrt((degrees.mean() + 1) / 2 / n_nodes))
 
-def random_graph():
-
-    # Generate random nodes of coordinates from 1 - 10
-    nodes = {}
-    i = 0
-    while i < 5:
-        x = random.randint(0, 10)
-        y = random.randint(0, 10)
-        if (x, y) not in list(nodes.keys()):
-            nodes.setdefault(i + 1, (x, y))
-            i+=1
-
-    # Generate random edges from random nodes with random costs
-    edges = {}
-    for node, (x0, y0) in nodes.items():
-        # Avoid self-connected: {(x,x):c} and duplicate edges with potentially different cost: {(x,y):c1, (x,y):c2} 
-        possible_nodes = [n for n in nodes if n != node and (node, n) not in edges and (n, node) not in edges]
-        random.shuffle(possible_nodes)  # Randomize connection order
-        
-        number_of_connected_nodes = min(random.randint(0, 3), len(possible_nodes))
-        
-        for i in range(number_of_connected_nodes):
-            connected_node = possible_nodes[i]
-            (x1, y1) = nodes[connected_node]
-            distance = math.sqrt((x1 - x0)**2 + (y1 - y0)**2)
-            cost_forward = math.ceil(distance)*2
-            different_cost = bool(random.getrandbits(1))
-            directed = bool(random.getrandbits(1))
-
-            edges[(node, connected_node)] = cost_forward
-            
-            if not directed:
-                cost_backward = cost_forward if different_cost else cost_forward + 1
-                edges[(connected_node, node)] = cost_backward
-
-    # Generate random origin node
-    origin=random.randint(1, len(nodes))
-
-    # Generate random destinations list
-    number_of_destinations=random.randint(1, len(nodes) - 3) # Randomize the number of destination in the list
-    destinations=list()
-    while len(destinations) < number_of_destinations:
-        destination=random.choice(list(nodes.keys())) # Choose random node to be a destination
-
-        # Avoide duplicate detination and destination being the origin
-        if destination != origin and destination not in destinations:
-            destinations.append(destination)
-
-    # Convert nodes dictionary to string
-    nodes_str="Nodes:\n"
-    for node, coor in nodes.items():
-        node_str=f"{node}: ({coor[0]},{coor[1]})\n" # 1: (2,3)
-        nodes_str+=node_str
-
-    # Convert edges dictionary to string
-    edges_str="Edges:\n"
-    for edge, node in edges.items():
-        edge_str=f"({edge[0]},{edge[1]}): {node}\n" # (1,2): 3
-        edges_str+=edge_str
-
-    # Convert origin to string
-    origin_str=f"Origin:\n{origin}\n"
-
-    # Convert destinations list to string
-    dests_str="Destinations:\n"
-    for dest in destinations: # If it isn't the last element
-        if dest is not destinations[-1]:
-            dest_str=f"{dest}; " # 1; 2; ..
+    # Sort the nodes by cell, so the nodes in each cell are a slice of order
+    cell_xy = (coords // cell).astype(np.int64)
+    width, height = cell_xy.max(axis=0) + 1
+    cell_ids = cell_xy[:, 0] * height + cell_xy[:, 1]
+    order = np.argsort(cell_ids, kind='stable')
+    counts = np.bincount(cell_ids, minlength=width * height)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    # Work through the nodes in cell order, so the candidates of a block are close together in memory
+    sources, targets = [], []
+    for first in range(0, n_nodes, block):
+        nodes = order[first:first + block]
+        nodes = nodes[degrees[nodes] > 0]
+        # Every (node, candidate) pair in the 3 x 3 cells around each node, nodes by their place in the block
+        a, b = [], []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                x, y = cell_xy[nodes, 0] + dx, cell_xy[nodes, 1] + dy
+                inside = np.flatnonzero((x >= 0) & (x < width) & (y >= 0) & (y < height))
+                cell_id = x[inside] * height + y[inside]
+                count = counts[cell_id]
+                ends = np.cumsum(count)
+                in_cell = np.arange(ends[-1] if len(ends) else 0) - np.repeat(ends - count, count)
+                a.append(np.repeat(inside, count))
+                b.append(order[np.repeat(starts[cell_id], count) + in_cell])
+        a, b = np.concatenate(a), np.concatenate(b)
+        keep = nodes[a] != b
+        a, b = a[keep], b[keep]
+        delta = coords[nodes[a]] - coords[b]
+        squared = delta[:, 0] ** 2 + delta[:, 1] ** 2
+        if neighbours == "radius":
+            within = squared <= radius ** 2
+            a, b = a[within], b[within]
+            rank_by = rng.integers(0, 2 ** 31, len(a))
+            key = a * 2 ** 31 + rank_by
         else:
-            dest_str=f"{dest}" # ;.. 3
-        dests_str+=dest_str
+            key = a * (int(squared.max(initial=0)) + 1) + squared
+        # The first degrees[node] candidates of each node, nearest (or random) first
+        by_node = np.argsort(key, kind='stable')
+        a, b = a[by_node], b[by_node]
+        group_starts = np.flatnonzero(np.concatenate([[True], a[1:] != a[:-1]]))
+        group_sizes = np.diff(np.append(group_starts, len(a)))
+        rank = np.arange(len(a)) - np.repeat(group_starts, group_sizes)
+        chosen = rank < degrees[nodes[a]]
+        sources.append(nodes[a[chosen]])
+        targets.append(b[chosen])
+
+    # Back in node order, each node's neighbours still nearest (or random) first
+    sources, targets = np.concatenate(sources), np.concatenate(targets)
+    by_source = np.argsort(sources, kind='stable')
+    return sources[by_source], targets[by_source]
+
+
+def write_graph(file, coords, sources, targets, costs, origin, destinations, chunk=2 ** 16):
+    """Write a graph from random_graph_arrays in the text file format to a
+    binary file, chunk nodes or links at a time, so no more than a chunk of
+    it is ever held as text."""
+
+    # Convert nodes, edges, origin and destinations to strings
+    file.write(b"Nodes:\n")
+    for i in range(0, len(coords), chunk):
+        block = coords[i:i + chunk].T.tolist()
+        ids = range(i + 1, i + 1 + len(block[0]))
+        file.write("".join(map("{}: ({},{})\n".format, ids, *block)).encode()) # 1: (2,3)
+    file.write(b"Edges:\n")
+    for i in range(0, len(sources), chunk):
+        block = sources[i:i + chunk].tolist(), targets[i:i + chunk].tolist(), costs[i:i + chunk].tolist()
+        file.write("".join(map("({},{}): {}\n".format, *block)).encode()) # (1,2): 3
+    file.write(f"Origin:\n{origin}\n".encode())
+    file.write(("Destinations:\n" + "; ".join(map(str, destinations))).encode()) # 1; 2; ..; 3
+
+
+def graph_text(coords, sources, targets, costs, origin, destinations):
+    """Return a graph from random_graph_arrays in the text file format."""
+    buffer = io.BytesIO()
+    write_graph(buffer, coords, sources, targets, costs, origin, destinations)
+    return buffer.getvalue().decode()
+
+
+class GraphExporter:
+    """Export graphs to the first free {base_name}{i}.txt files in
+    directory (by default, the current one). The directory is scanned once for the numbers already taken,
+    and a counter moves on from there, instead of checking test_1.txt,
+    test_2.txt, ... again for every file."""
+
+    def __init__(self, directory="", base_name="test_"):
+        self.directory = directory
+        self.base_name = base_name
+        pattern = re.compile(re.escape(base_name) + r"([0-9]+)\.txt")
+        self.taken = {int(match.group(1)) for match in map(pattern.fullmatch, os.listdir(directory or ".")) if match}
+        self.i = 1 # Starting index
+
+    def reserve(self):
+        """Create the next free file, empty, and return its name, so it can
+        be written later (by another process, say) without the name being
+        taken in between."""
+        while True:
+            while self.i in self.taken:
+                self.i += 1
+            self.taken.add(self.i)
+            filename = os.path.join(self.directory, f"{self.base_name}{self.i}.txt")
 
-    text_file_str=nodes_str+edges_str+origin_str+dests_str
+            # Create the file, unless something else has since
+            try:
+                open(filename, "xb").close()
+            except FileExistsError:
+                continue
+            return filename
+
+    def export(self, graph):
+        """Write graph (the text of a map file, or a function that writes
+        one to the binary file it is given) to the next free file, and
+        return its name."""
+        filename = self.reserve()
+        with open(filename, "wb", buffering=2 ** 20) as file:
+            if callable(graph):
+                graph(file)
+            else:
+                file.write(graph.encode())
+        print(f"Exported to {filename}")
+        return filename
 
-    return  nodes, edges, origin, destinations, text_file_str
 
 def export_graph(content, base_name="test_"):
 
     # Export a string to a text file with incrementing filename
-    i = 1 # Starting index
-    while True:
-        extension = ".txt" # Text file
-        filename = f"{base_name}{i}{extension}"
+    return GraphExporter(base_name=base_name).export(content)
+
+
+def graph_seed(entropy, i):
+    """Return the seed of graph i (from 0) of a run whose seed sequence has
+    this entropy. It depends only on the two, so graph i is the same
+    however many graphs are generated, in whatever order or process."""
+    return np.random.SeedSequence(entropy, spawn_key=(i,))
+
+
+def generate_graph(i, entropy, options, filename=None, keep=False):
+    """Generate graph i of a run (see graph_seed) from random_graph_arrays
+    with the positional arguments options, and write it to filename. Return
+    (data, arrays): data is filename, or the map file's bytes if there is
+    no filename, and arrays are the graph's arrays if keep, else None."""
+    arrays = random_graph_arrays(*options, rng=np.random.default_rng(graph_seed(entropy, i)))
+    if filename is None:
+        buffer = io.BytesIO()
+        write_graph(buffer, *arrays)
+        data = buffer.getvalue()
+    else:
+        with open(filename, "wb", buffering=2 ** 20) as file:
+            write_graph(file, *arrays)
+        data = filename
+    return data, arrays if keep else None
 
-        # If file not exist, create file and end loop
-        if not os.path.exists(filename):
-            with open(filename, "w") as file:
-                file.write(content)
-            print(f"Exported to {filename}")
-            break
-        
-        # If it exist, increment index and start again
-        i += 1
 
-    return filename
+def generate_graph_batch(jobs):
+    """Return [generate_graph(*job) for job in jobs], one task for a worker."""
+    return [generate_graph(*job) for job in jobs]
+
+
+def generate_graphs(n_graphs, entropy, options, filenames=None, keep=False, workers=None, batch=None, window=None):
+    """Yield generate_graph(i, ...) for graphs 0 to n_graphs - 1, in order,
+    writing graph i to the i-th of filenames (an iterable, only advanced as
+    the graphs are started) if given. With workers, the graphs are
+    generated on a ProcessPoolExecutor with that many processes, batch
+    graphs per task (by default, about 10^4 nodes' worth) and at most
+    window tasks (by default, 4 per process) at a time, so the files are
+    written by the workers and only a window of results is ever held here."""
+    filenames = iter(filenames) if filenames is not None else itertools.repeat(None)
+    jobs = ((i, entropy, options, next(filenames), keep) for i in range(n_graphs))
+    if workers is None:
+        for job in jobs:
+            yield generate_graph(*job)
+        return
+    batch = batch or max(1, 10 ** 4 // options[0])
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(workers) as executor:
+        pending = collections.deque()
+        while batch_jobs := list(itertools.islice(jobs, batch)):
+            pending.append(executor.submit(generate_graph_batch, batch_jobs))
+            if len(pending) >= (window or 4 * workers):
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
 
 
 def runGenerator():
-    no_of_tests = int(sys.argv[1])
-    i = 0
+    parser = argparse.ArgumentParser(description="Generate random graphs as test_{i}.txt files.")
+    parser.add_argument("tests", type=int, help="number of graphs to generate")
+    parser.add_argument("-d", "--draw", action="store_true", help="draw the generated graphs")
+    parser.add_argument("-n", "--nodes", type=int, default=5, help="nodes per graph (default: 5)")
+    parser.add_argument("--extent", type=int, help="coordinates run from 0 to extent "
+                                                   "(default: 10, or about 2 * sqrt(nodes) if larger)")
+    parser.add_argument("--degree", type=int, default=3, help="out-links per node, see --distribution (default: 3)")
+    parser.add_argument("--distribution", choices=DEGREE_DISTRIBUTIONS, default="uniform",
+                        help="uniform: 0 to degree, poisson: mean degree, fixed: degree (default: uniform)")
+    parser.add_argument("--neighbours", choices=NEIGHBOURS, default="random",
+                        help="link to random nodes, the nearest nodes, or random nodes within --radius "
+                             "(default: random)")
+    parser.add_argument("--radius", type=float, help="distance of the neighbours linked with --neighbours radius")
+    parser.add_argument("--directed-ratio", type=float, default=0.5,
+                        help="fraction of links without a link back (default: 0.5)")
+    parser.add_argument("--asymmetric-ratio", type=float, default=0.5,
+                        help="fraction of links back that cost one more (default: 0.5)")
+    parser.add_argument("--destinations", type=int, help="most destinations per graph (default: nodes - 3)")
+    parser.add_argument("--seed", type=int, help="seed for the random numbers, to generate the same graphs again")
+    parser.add_argument("--container", metavar="FILE",
+                        help="write all the graphs into one graph container FILE instead of test_{i}.txt files")
+    parser.add_argument("-j", "--jobs", type=int, metavar="N",
+                        help="generate the graphs on N worker processes (the graphs are the same as without it)")
+    args = parser.parse_args()
+    options = (args.nodes, args.extent, args.degree, args.distribution, args.directed_ratio,
+               args.asymmetric_ratio, args.neighbours, args.radius, args.destinations)
+    # Every graph's seed is derived from the run's seed and the graph's number
+    entropy = np.random.SeedSequence(args.seed).entropy
     maps = {}
+    if args.container:
+        output = GraphContainerWriter(args.container)
+        filenames = None
+    else:
+        output = GraphExporter()
+        reserved = []
+
+        def reserve_files():
+            for _ in range(args.tests):
+                reserved.append(output.reserve())
+                yield reserved[-1]
+        filenames = reserve_files()
 
-    # Looping through the number of tests generated
-    while i < no_of_tests:
+    # Looping through the graphs as they are generated, in order; the workers write them straight
+    # to their files, or hand back their bytes to be added to the container
+    try:
+        graphs = generate_graphs(args.tests, entropy, options, filenames, args.draw, args.jobs)
+        for i, (data, arrays) in enumerate(graphs):
 
-        # Extract components from randomized graph
-        map_nodes, map_edges, map_origin, map_dests, map_str = random_graph()
+            # Title each graph by its file name (or graph id)
+            if args.container:
+                title = f"Graph {output.add(data)} of {args.container}"
+            else:
+                print(f"Exported to {data}")
+                title = f"Graph {os.path.basename(data).removesuffix('.txt')}"
+
+            # Appends the components into the dictionary, only if they are to be drawn
+            if args.draw:
+                coords, sources, targets, costs, origin, destinations = arrays
+                maps[i + 1] = dict(nodes = dict(zip(range(1, len(coords) + 1), map(tuple, coords.tolist()))),
+                                   edges = dict(zip(zip(sources.tolist(), targets.tolist()), costs.tolist())),
+                                   origin = origin,
+                                   dests = destinations,
+                                   title = title) # {1:{nodes:A, edges:B, ...}, 2:{...}, ...}
+    except ValueError as error:
+        # Remove the files reserved for graphs that were never written
+        if args.container:
+            output.close()
+            os.remove(args.container)
+        else:
+            for filename in reserved:
+                if os.path.getsize(filename) == 0:
+                    os.remove(filename)
+        parser.error(str(error))
 
-        # Extraxt title from exported filename
-        filename = export_graph(map_str).removesuffix(".txt")
-        title = f"Graph {filename}"
+    if args.container:
+        output.close()
+        print(f"Exported {args.tests} graphs to {args.container}")
 
-        # Appends the components into the dictionary
-        maps[i + 1] = dict(nodes = map_nodes, 
-                           edges = map_edges,
-                           origin = map_origin,
-                           dests = map_dests,
-                           title = title) # {1:{nodes:A, edges:B, ...}, 2:{...}, ...}       
+    # Draw the generated graphs if the user asked for it; Tk and the GUI are only imported then
+    if args.draw:
+        import tkinter as tk
+        from graph_gui import GraphGUI
 
-        # Increment index
-        i+=1
+        # Initiate Tkinter root
+        root = tk.Tk()
+        app = GraphGUI(root)
 
-    # Extract whether users wants to draw the generated graph
-    if len(sys.argv) > 2:
-        if sys.argv[2] == "-d":
+        # Draw graph for each item in dictionary
+        for id, graph in maps.items():
+            app.draw_graph(graph["nodes"], graph["edges"], graph["origin"], graph["dests"], graph["title"])
 
-            # Initiate Tkinter root
-            root = tk.Tk()
-            app = GraphGUI(root)
-            
-            # Draw graph for each item in dictionary 
-            for id, map in maps.items():               
-                app.draw_graph(map["nodes"], map["edges"], map["origin"], map["dests"], map["title"])           
+        # Stop the program after the app closed
+        root.protocol("WM_DELETE_WINDOW", app.on_closing)
 
-            # Stop the program after the app closed    
-            root.protocol("WM_DELETE_WINDOW", app.on_closing)
+        # Start Tkinter event loop
+        root.mainloop()
 
-            # Start Tkinter event loop
-            root.mainloop()
 
-runGenerator()
\ No newline at end of file
+if __name__ == "__main__":
+    runGenerator()
@@ -0,0 +1,91 @@
+from pathfinding import (ContractionHierarchy, Graph, GraphProblem, Landmarks, Node, alt_search,
+                         bidirectional_astar_search, contraction_hierarchy_search, iterative_deepening_astar_search,
+                         run_algorithm, solve_batch)
+
+
+def cyclic_graph():
+    """A graph whose origin 5 reaches the cycles 4 -> 7 -> 1 -> 4 and
+    4 -> 1 -> 4, but not the destinations 6 and 2."""
+    graph = Graph({6: {3: 17, 4: 32}, 5: {4: 14, 1: 14}, 4: {7: 26, 1: 32}, 2: {4: 54}, 7: {1: 28}, 1: {4: 32}})
+    graph.locations = {i: (i, i % 3) for i in range(1, 8)}
+    return graph
+
+
+def test_iterative_deepening_astar_search_unreachable_goal():
+    for table_size in (0, 2, 1000):
+        node, visited, _ = iterative_deepening_astar_search(GraphProblem(5, [6, 2], cyclic_graph()),
+                                                            table_size=table_size)
+        assert node is None
+        assert visited < 100
+
+
+def test_graph_problem_without_located_goals():
+    graph = cyclic_graph()
+    for goals in ([], [99], [99, 7]):
+        for method in ("DFS", "BFS", "GBFS", "AS", "CUS1", "CUS2"):
+            problem = GraphProblem(5, goals, graph)
+            node, _, _ = run_algorithm(method, problem)
+            assert (node and node.state) == (7 if 7 in goals else None)
+            assert problem.h(Node(4)) == 0
+
+
+def test_alt_search_from_and_to_nodes_without_links():
+    graph = cyclic_graph()
+    graph.locations[8] = (0, 0)
+    landmarks = Landmarks(graph, k=2)
+    for origin, goals in ((8, [4]), (5, [8]), (8, [8]), (5, [9])):
+        node, _, _ = alt_search(GraphProblem(origin, goals, graph), landmarks)
+        assert (node and node.state) == (8 if origin == 8 in goals else None)
+    node, _, _ = alt_search(GraphProblem(5, [8, 7], graph), landmarks)
+    assert node.state == 7 and node.path_cost == 40
+
+
+def test_contraction_hierarchy_search_from_and_to_nodes_without_links():
+    graph = cyclic_graph()
+    graph.locations[8] = (0, 0)
+    hierarchy = ContractionHierarchy(graph)
+    for origin, goals in ((8, [4]), (5, [8]), (8, [8])):
+        node, _, _ = contraction_hierarchy_search(GraphProblem(origin, goals, graph), hierarchy)
+        assert (node and node.state) == (8 if origin == 8 in goals else None)
+    node, _, _ = contraction_hierarchy_search(GraphProblem(5, [8, 7], graph), hierarchy)
+    assert node.state == 7 and node.path_cost == 40
+
+
+def test_bidirectional_astar_search_with_a_node_heuristic():
+    graph = cyclic_graph()
+    problem = GraphProblem(5, [7], graph)
+    for h in (None, problem.h, Landmarks(graph, k=2).heuristic(problem.goal)):
+        node, _, _ = bidirectional_astar_search(problem, h)
+        assert node.state == 7 and node.path_cost == 40
+
+
+def test_graph_problem_with_tuple_nodes():
+    graph = Graph({(0, 0): {(0, 1): 1}, (0, 1): {(1, 1): 1}})
+    graph.locations = {(x, y): (x, y) for x in range(2) for y in range(2)}
+    for method in ("DFS", "BFS", "GBFS", "AS", "CUS1", "CUS2"):
+        node, _, _ = run_algorithm(method, GraphProblem((0, 0), (1, 1), graph))
+        assert node.state == (1, 1) and node.path_cost == 2
+
+
+def test_alt_search_with_tuple_nodes():
+    graph = Graph({(0, 0): {(0, 1): 1}, (0, 1): {(1, 1): 1}})
+    graph.locations = {(x, y): (x, y) for x in range(2) for y in range(2)}
+    landmarks = Landmarks(graph, k=2)
+    assert landmarks.heuristic((1, 1))(Node((0, 0))) == 2
+    node, _, _ = alt_search(GraphProblem((0, 0), (1, 1), graph), landmarks)
+    assert node.state == (1, 1) and node.path_cost == 2
+
+
+def test_contraction_hierarchy_query_with_tuple_nodes():
+    graph = Graph({(0, 0): {(0, 1): 1}, (0, 1): {(1, 1): 1}})
+    path = ContractionHierarchy(graph).query((0, 0), (1, 1))
+    assert [node.state for node in path] == [(0, 0), (0, 1), (1, 1)]
+
+
+def test_solve_batch_with_tuple_nodes():
+    graph = Graph({(0, 0): {(0, 1): 1}, (0, 1): {(1, 1): 1}})
+    graph.locations = {(x, y): (x, y) for x in range(2) for y in range(2)}
+    queries = [((0, 0), (1, 1)), ((0, 1), [(1, 1), (0, 0)])]
+    for method in ("CUS1", "AS"):
+        results = sorted(solve_batch(graph, queries, method), key=lambda result: result[0])
+        assert [(node.state, node.path_cost) for _, node, _, _ in results] == [((1, 1), 2), ((1, 1), 1)]